@@ -1,3 +1,9 @@
+import time
+from functools import lru_cache
+from itertools import islice
+
+import numpy as np
+
 # itertools.islice
 # def islice(iterable, *args):
     # islice('ABCDEFG', 2) --> A B
@@ -22,3 +28,106 @@ def pascal(n):
     line.append(1)
     return line
 
+
+def pascal_rows(copy=True):
+    """ iterative version of pascal, yielding [1], [1, 1], [1, 2, 1], ... without end. Each row is updated in place from
+    the one before in a single buffer, and with copy=False that buffer is what's yielded, to be overwritten by the next
+    row """
+    row = [1]
+    while True:
+        yield row[:] if copy else row
+        row.append(1)
+        for k in range(len(row) - 2, 0, -1):
+            row[k] += row[k - 1]
+
+
+@lru_cache(maxsize=128)
+def pascal_row(n):
+    """ same row as pascal(n), with no recursion limit, cached for repeated queries. A tuple so the cached row can't be
+    changed by the caller """
+    return tuple(next(islice(pascal_rows(copy=False), n - 1, None)))
+
+
+def binomial_row(n):
+    """ C(n, k) for k = 0..n by the multiplicative formula, so binomial_row(n) == pascal(n + 1) in O(n) steps """
+    row = [1] * (n + 1)
+    for k in range(1, n // 2 + 1):
+        row[k] = row[n - k] = row[k - 1] * (n - k + 1) // k
+    return row
+
+
+def factorial_tables(n, p):
+    """ factorials and inverse factorials 0..n modulo the prime p, for n < p """
+    fact = [1] * (n + 1)
+    for i in range(1, n + 1):
+        fact[i] = fact[i - 1] * i % p
+    inv = [1] * (n + 1)
+    inv[n] = pow(fact[n], p - 2, p)
+    for i in range(n, 0, -1):
+        inv[i - 1] = inv[i] * i % p
+    return fact, inv
+
+
+def pascal_row_mod(n, p):
+    """ binomial_row(n) modulo the prime p. Below p the row comes straight from factorial tables, otherwise from Lucas'
+    theorem, C(n, k) = C(n // p, k // p) * C(n % p, k % p) mod p, a base p digit of n at a time """
+    fact, inv = factorial_tables(min(n, p - 1), p)
+
+    def small_row(d):
+        # row d < p, padded with the zeros C(d, j) for d < j < p
+        return [fact[d] * inv[k] % p * inv[d - k] % p for k in range(d + 1)]
+
+    if n < p:
+        return small_row(n)
+    digits = []
+    while n:
+        n, d = divmod(n, p)
+        digits.append(d)
+    row, top = small_row(digits[-1]), digits[-1]
+    for d in reversed(digits[:-1]):
+        low = small_row(d) + [0] * (p - 1 - d)
+        top = top * p + d
+        row = [a * b % p for a in row for b in low][:top + 1]
+    return row
+
+
+def pascal_row_np(n, p=None):
+    """ binomial_row(n) as a uint64 array, adding each row to itself shifted by one in a single vectorized step.
+    Exact up to n = 67; past that a modulus p below 2 ** 63 is needed to keep the sums from overflowing """
+    if p is None and n > 67:
+        raise ValueError('C({}, k) overflows uint64, give a modulus'.format(n))
+    row = np.zeros(n + 1, dtype=np.uint64)
+    row[0] = 1
+    for i in range(1, n + 1):
+        row[1:i + 1] += row[:i]
+        if p is not None:
+            row[1:i + 1] %= p
+    return row
+
+
+def benchmark(sizes=(10, 10 ** 3, 10 ** 5), p=10 ** 9 + 7, np_limit=2 * 10 ** 4):
+    """ prints seconds per row for each implementation, or why it couldn't make the row """
+    runs = [
+        ('pascal', lambda n: pascal(n + 1)),
+        ('binomial_row', binomial_row),
+        ('pascal_row_mod', lambda n: pascal_row_mod(n, p)),
+        ('pascal_row_np', lambda n: pascal_row_np(n, p)),
+    ]
+    print('{:<16}'.format('n') + ''.join('{:>16}'.format(n) for n in sizes))
+    for name, run in runs:
+        results = []
+        for n in sizes:
+            if run is runs[-1][1] and n > np_limit:
+                results.append('skipped')
+                continue
+            start = time.perf_counter()
+            try:
+                run(n)
+                results.append('{:.5f}s'.format(time.perf_counter() - start))
+            except RecursionError:
+                results.append('RecursionError')
+        print('{:<16}'.format(name) + ''.join('{:>16}'.format(a) for a in results))
+
+
+if __name__ == '__main__':
+    benchmark()
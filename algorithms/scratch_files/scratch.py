@@ -1,4 +1,5 @@
 import random
+from abc import ABC, abstractmethod
 
 uns_cards = [5, 13, 47, 17, 53, 2, 7, 29, 41, 11, 23]
 uns_cards2 = [5, 13, 47, 17, 53, 2, 7, 29, 41, 11, 23, 101 ]
@@ -16,6 +17,7 @@ class CardSort:
         self.max_ind = None
         self.max_val = None
         self.total_checks = 0
+        self.total_moves = 0
         self._initial = True
         self._first = True
         self.unsorted_len = 2
@@ -26,7 +28,9 @@ class CardSort:
             self.unsorted_len = index + 1
         if self._first:
             self.min_val, self.max_val = value, value
-        if value <= self.min_val:
+            self.min_ind, self.max_ind = index, index
+        # first min and last max, so the two differ even when every remaining card is equal
+        if value < self.min_val:
             self.min_ind, self.min_val = index, value
         if value >= self.max_val:
             self.max_ind, self.max_val = index, value
@@ -38,11 +42,15 @@ class CardSort:
             self._first = False
             self.total_checks += 1
         self._initial = False
+        # a pop moves the card and shifts every card after it down, an insert at the front shifts every card up
+        self.total_moves += len(self.unsorted) - self.min_ind
         unsort_min = self.unsorted.pop(self.min_ind)
         if self.max_ind > self.min_ind:
             self.max_ind -= 1
+        self.total_moves += len(self.unsorted) - self.max_ind
         unsort_max = self.unsorted.pop(self.max_ind)
         self.sorted1.append(unsort_min)
+        self.total_moves += len(self.sorted2)
         self.sorted2.insert(0, unsort_max)
         self.unsorted_len -= 2
 
@@ -55,11 +63,151 @@ class CardSort:
             self.sorted1 + self.sorted2, self.total_checks, len(self.sorted1 + self.sorted2))
 
 
-c = CardSort(uns_cards)
-print(c.run())
-c2 = CardSort(uns_cards2)
-print(c2.run())
-c = CardSort(uns_cards3)
-print(c.run())
-c = CardSort(uns_cards4)
-print(c.run())
+class SortEngine(ABC):
+    """ base class for the O(n log n) engines, keeping the same total_checks count as CardSort plus total_moves, the
+    number of times a card is written to a new position. Subclasses implement sort() using less() for every comparison
+    """
+    def __init__(self, unsorted):
+        self.unsorted = unsorted
+        self.total_checks = 0
+        self.total_moves = 0
+
+    def less(self, a, b):
+        self.total_checks += 1
+        return a < b
+
+    @abstractmethod
+    def sort(self, cards):
+        """ returns cards in order """
+
+    def run(self):
+        result = self.sort(list(self.unsorted))
+        return 'Sorted list: {} \nTotal cards checked: {} \nn = {}'.format(result, self.total_checks, len(result))
+
+
+class MergeSort(SortEngine):
+    """ bottom-up merge sort, merging runs of width 1, 2, 4, ... between two buffers """
+    def sort(self, cards):
+        n = len(cards)
+        src, dst = cards, [None] * n
+        width = 1
+        while width < n:
+            for lo in range(0, n, 2 * width):
+                self.merge(src, dst, lo, min(lo + width, n), min(lo + 2 * width, n))
+            src, dst = dst, src
+            width *= 2
+        return src
+
+    def merge(self, src, dst, lo, mid, hi):
+        i, j = lo, mid
+        for k in range(lo, hi):
+            if j >= hi or i < mid and not self.less(src[j], src[i]):
+                dst[k] = src[i]
+                i += 1
+            else:
+                dst[k] = src[j]
+                j += 1
+        self.total_moves += hi - lo
+
+
+class HeapSort(SortEngine):
+    """ in place heap sort: heapify, then repeatedly swap the max to the end and sift the new root down """
+    def sort(self, cards):
+        n = len(cards)
+        for start in range(n // 2 - 1, -1, -1):
+            self.sift_down(cards, start, n)
+        for end in range(n - 1, 0, -1):
+            cards[0], cards[end] = cards[end], cards[0]
+            self.total_moves += 2
+            self.sift_down(cards, 0, end)
+        return cards
+
+    def sift_down(self, cards, root, end):
+        item = cards[root]
+        child = 2 * root + 1
+        while child < end:
+            if child + 1 < end and self.less(cards[child], cards[child + 1]):
+                child += 1
+            if not self.less(item, cards[child]):
+                break
+            cards[root] = cards[child]
+            self.total_moves += 1
+            root, child = child, 2 * child + 1
+        cards[root] = item
+        self.total_moves += 1
+
+
+class RunSort(MergeSort):
+    """ natural merge sort in the style of timsort: finds the ascending runs already in the cards (reversing strictly
+    descending ones), extends short runs to min_run with binary insertion, then merges neighbouring runs """
+    min_run = 32
+
+    def sort(self, cards):
+        n = len(cards)
+        bounds = [0]
+        lo = 0
+        while lo < n:
+            hi = self.run_end(cards, lo, n)
+            if hi - lo < self.min_run:
+                hi = self.extend_run(cards, lo, hi, min(lo + self.min_run, n))
+            bounds.append(hi)
+            lo = hi
+        src, dst = cards, [None] * n
+        while len(bounds) > 2:
+            merged = [0]
+            for i in range(2, len(bounds), 2):
+                self.merge(src, dst, bounds[i - 2], bounds[i - 1], bounds[i])
+                merged.append(bounds[i])
+            if len(bounds) % 2 == 0:
+                # odd run out, copied across unchanged
+                dst[bounds[-2]:] = src[bounds[-2]:]
+                self.total_moves += n - bounds[-2]
+                merged.append(n)
+            bounds = merged
+            src, dst = dst, src
+        return src
+
+    def run_end(self, cards, lo, n):
+        hi = lo + 1
+        if hi == n:
+            return hi
+        if self.less(cards[hi], cards[lo]):
+            while hi + 1 < n and self.less(cards[hi + 1], cards[hi]):
+                hi += 1
+            cards[lo:hi + 1] = cards[lo:hi + 1][::-1]
+            self.total_moves += hi + 1 - lo
+        else:
+            while hi + 1 < n and not self.less(cards[hi + 1], cards[hi]):
+                hi += 1
+        return hi + 1
+
+    def extend_run(self, cards, lo, hi, end):
+        for i in range(hi, end):
+            item = cards[i]
+            left, right = lo, i
+            while left < right:
+                mid = (left + right) // 2
+                if self.less(item, cards[mid]):
+                    right = mid
+                else:
+                    left = mid + 1
+            cards[left + 1:i + 1] = cards[left:i]
+            cards[left] = item
+            self.total_moves += i - left + 1
+        return end
+
+
+sort_engines = {'cardsort': CardSort, 'merge': MergeSort, 'heap': HeapSort, 'run': RunSort}
+
+
+if __name__ == '__main__':
+    for engine in (MergeSort, HeapSort, RunSort):
+        print(engine.__name__, engine(uns_cards4).run())
+    c = CardSort(uns_cards)
+    print(c.run())
+    c2 = CardSort(uns_cards2)
+    print(c2.run())
+    c = CardSort(uns_cards3)
+    print(c.run())
+    c = CardSort(uns_cards4)
+    print(c.run())
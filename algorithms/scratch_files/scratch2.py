@@ -1,3 +1,8 @@
+import time
+import tracemalloc
+from array import array
+
+
 class Node:
     def __init__(self,initdata):
         self.data = initdata
@@ -25,9 +30,134 @@ class UnorderedList:
                 current = current.next
         return found
 
-mylist = UnorderedList()
+class CompactList:
+    """ UnorderedList without a Node object per item: values sit in a list and the next links in a parallel array of
+    indexes, -1 ending the chain, with removed slots kept on a free list for reuse. Unless indexed is False, a dict of
+    value counts makes search O(1) """
+    def __init__(self, items=(), indexed=True):
+        self.values = []
+        self.next = array('l')
+        self.head = -1
+        self.free = -1
+        self.size = 0
+        self.index = {} if indexed else None
+        self.extend(items)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        current = self.head
+        while current != -1:
+            yield self.values[current]
+            current = self.next[current]
+
+    def add(self, item):
+        if self.free != -1:
+            slot = self.free
+            self.free = self.next[slot]
+            self.values[slot] = item
+            self.next[slot] = self.head
+        else:
+            slot = len(self.values)
+            self.values.append(item)
+            self.next.append(self.head)
+        self.head = slot
+        self.size += 1
+        if self.index is not None:
+            self.index[item] = self.index.get(item, 0) + 1
+
+    def extend(self, items):
+        """ adds every item as add() would, in bulk when there are no free slots to fill first """
+        if self.free != -1:
+            for item in items:
+                self.add(item)
+            return
+        start = len(self.values)
+        self.values.extend(items)
+        n = len(self.values) - start
+        if not n:
+            return
+        # each new item links to the one added before it, the first to the old head
+        self.next.append(self.head)
+        self.next.extend(range(start, start + n - 1))
+        self.head = start + n - 1
+        self.size += n
+        if self.index is not None:
+            for item in self.values[start:]:
+                self.index[item] = self.index.get(item, 0) + 1
+
+    def search(self, item):
+        if self.index is not None:
+            return item in self.index
+        values, links = self.values, self.next
+        current = self.head
+        while current != -1:
+            if values[current] == item:
+                return True
+            current = links[current]
+        return False
+
+    def remove(self, item):
+        """ unlinks the first node holding item, raising ValueError if there isn't one """
+        previous, current = -1, self.head
+        while current != -1 and self.values[current] != item:
+            previous, current = current, self.next[current]
+        if current == -1:
+            raise ValueError('{} not in list'.format(item))
+        if previous == -1:
+            self.head = self.next[current]
+        else:
+            self.next[previous] = self.next[current]
+        self.values[current] = None
+        self.next[current] = self.free
+        self.free = current
+        self.size -= 1
+        if self.index is not None:
+            self.index[item] -= 1
+            if not self.index[item]:
+                del self.index[item]
+
+
+def compare(n=10 ** 6, searches=100):
+    """ prints build time, peak memory and search time for n items in UnorderedList and CompactList """
+    items = list(range(n))
+    targets = [items[a * n // searches] for a in range(searches)]
+
+    def build_unordered():
+        ul = UnorderedList()
+        for item in items:
+            ul.add(item)
+        return ul
+
+    builds = [
+        ('UnorderedList', build_unordered),
+        ('CompactList', lambda: CompactList(items, indexed=False)),
+        ('CompactList indexed', lambda: CompactList(items)),
+    ]
+    for name, build in builds:
+        start = time.perf_counter()
+        built = build()
+        build_seconds = time.perf_counter() - start
+        # built again under tracemalloc, which slows down allocation too much to time it
+        del built
+        tracemalloc.start()
+        built = build()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for target in targets:
+            built.search(target)
+        search_seconds = time.perf_counter() - start
+        print('{:<20} build {:.3f}s, peak {:.1f} MB, {} searches {:.4f}s'.format(
+            name, build_seconds, peak / 2 ** 20, searches, search_seconds))
+
+
+if __name__ == '__main__':
+    mylist = UnorderedList()
 
-for i in [31, 77, 17, 93, 26]:
-    mylist.add(i)
+    for i in [31, 77, 17, 93, 26]:
+        mylist.add(i)
 
-print(mylist.search(17))
+    print(mylist.search(17))
+    compare()
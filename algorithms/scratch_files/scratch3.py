@@ -24,13 +24,6 @@ class BinaryTree:
             setattr(self, position + '_child', new_node)
 
 
-bt = BinaryTree('a')
-bt.insert('left', 'b')
-bt.insert('right', 'c')
-bt.insert('left', 'd')
-
-
-
 def inorder(tree):
     if tree is not None:
         inorder(tree.left_child)
@@ -40,16 +33,181 @@ def inorder(tree):
 def preorder(tree):
     if tree:
         print(tree.key)
-        inorder(tree.left_child)
-        inorder(tree.right_child)
+        preorder(tree.left_child)
+        preorder(tree.right_child)
+
+
+class AVLNode:
+    __slots__ = ('key', 'value', 'left', 'right', 'height')
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.height = 1
+
+
+def height(node):
+    return node.height if node else 0
+
+
+class AVLTree:
+    """ binary search tree kept balanced by rotations, so the heights of every node's two subtrees differ by at most
+    one and search, insert and delete are O(log n). Traversals are generators using an explicit stack, so they don't
+    recurse however deep the tree """
+    def __init__(self, items=()):
+        self.root = None
+        self.size = 0
+        for key in items:
+            self.insert(key)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, key):
+        return self.find(key) is not None
+
+    def __iter__(self):
+        return self.inorder()
+
+    def find(self, key):
+        node = self.root
+        while node is not None and node.key != key:
+            node = node.left if key < node.key else node.right
+        return node
+
+    def search(self, key, default=None):
+        """ value stored with key """
+        node = self.find(key)
+        return default if node is None else node.value
+
+    def insert(self, key, value=None):
+        """ adds key, or replaces the value stored with it """
+        self.root = self._insert(self.root, key, value)
+
+    def delete(self, key):
+        """ removes key, raising KeyError if it isn't in the tree """
+        self.root = self._delete(self.root, key)
+
+    def _insert(self, node, key, value):
+        if node is None:
+            self.size += 1
+            return AVLNode(key, value)
+        if key < node.key:
+            node.left = self._insert(node.left, key, value)
+        elif node.key < key:
+            node.right = self._insert(node.right, key, value)
+        else:
+            node.value = value
+            return node
+        return self.rebalance(node)
+
+    def _delete(self, node, key):
+        if node is None:
+            raise KeyError(key)
+        if key < node.key:
+            node.left = self._delete(node.left, key)
+        elif node.key < key:
+            node.right = self._delete(node.right, key)
+        else:
+            if node.left is None or node.right is None:
+                self.size -= 1
+                return node.left or node.right
+            # take the place of the smallest key in the right subtree, then delete that
+            successor = node.right
+            while successor.left is not None:
+                successor = successor.left
+            node.key, node.value = successor.key, successor.value
+            node.right = self._delete(node.right, successor.key)
+        return self.rebalance(node)
+
+    @staticmethod
+    def update(node):
+        node.height = 1 + max(height(node.left), height(node.right))
+
+    def rotate_right(self, node):
+        top = node.left
+        node.left, top.right = top.right, node
+        self.update(node)
+        self.update(top)
+        return top
+
+    def rotate_left(self, node):
+        top = node.right
+        node.right, top.left = top.left, node
+        self.update(node)
+        self.update(top)
+        return top
+
+    def rebalance(self, node):
+        self.update(node)
+        balance = height(node.left) - height(node.right)
+        if balance > 1:
+            if height(node.left.left) < height(node.left.right):
+                node.left = self.rotate_left(node.left)
+            return self.rotate_right(node)
+        if balance < -1:
+            if height(node.right.right) < height(node.right.left):
+                node.right = self.rotate_right(node.right)
+            return self.rotate_left(node)
+        return node
+
+    def inorder(self):
+        stack, node = [], self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+    def preorder(self):
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            yield node.key
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+
+    def postorder(self):
+        stack, visited, node = [], None, self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            top = stack[-1]
+            if top.right is not None and top.right is not visited:
+                node = top.right
+            else:
+                visited = stack.pop()
+                yield visited.key
+
+    def range(self, low, high):
+        """ keys k with low <= k <= high in order, skipping the subtrees outside the range """
+        stack, node = [], self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left if low < node.key else None
+            node = stack.pop()
+            if high < node.key:
+                return
+            if not node.key < low:
+                yield node.key
+            node = node.right
 
 
-bt = BinaryTree('a')
-bt.insert('left', 'b')
-bt.insert('right', 'c')
-bt.insert('right', 'k')
-bt.insert('left', 'd')
+if __name__ == '__main__':
+    bt = BinaryTree('a')
+    bt.insert('left', 'b')
+    bt.insert('right', 'c')
+    bt.insert('right', 'k')
+    bt.insert('left', 'd')
 
-print(inorder(bt))
-print('\n')
-print(preorder(bt))
+    print(inorder(bt))
+    print('\n')
+    print(preorder(bt))
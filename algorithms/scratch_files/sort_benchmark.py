@@ -0,0 +1,84 @@
+""" Benchmarks CardSort and the sort engines in scratch.py over several input distributions and sizes, reporting
+comparisons, moves, time and peak memory. Results are printed and written as JSON or CSV for regression tracking:
+
+    python sort_benchmark.py [results.json | results.csv] """
+import csv
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from scratch import sort_engines
+
+sizes = (100, 1000, 10000)
+# CardSort is O(n^2), so is left out above this size
+max_sizes = {'cardsort': 2000}
+
+
+def few_unique(n, rng):
+    return [rng.randrange(10) for _ in range(n)]
+
+
+def nearly_sorted(n, rng):
+    cards = list(range(n))
+    for _ in range(max(n // 100, 1)):
+        i, j = rng.randrange(n), rng.randrange(n)
+        cards[i], cards[j] = cards[j], cards[i]
+    return cards
+
+
+distributions = {
+    'random': lambda n, rng: [rng.randrange(n * 10) for _ in range(n)],
+    'sorted': lambda n, rng: list(range(n)),
+    'reversed': lambda n, rng: list(range(n, 0, -1)),
+    'few_unique': few_unique,
+    'nearly_sorted': nearly_sorted,
+}
+
+
+def measure(engine, cards):
+    """ runs engine on a copy of cards, as CardSort consumes its list, once timed and once under tracemalloc """
+    sorter = engine(list(cards))
+    start = time.perf_counter()
+    sorter.run()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    engine(list(cards)).run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'checks': sorter.total_checks, 'moves': sorter.total_moves, 'seconds': seconds, 'peak_bytes': peak}
+
+
+def run_benchmarks(sizes=sizes, seed=0):
+    rng = random.Random(seed)
+    results = []
+    for dist, make in distributions.items():
+        for n in sizes:
+            cards = make(n, rng)
+            for name, engine in sort_engines.items():
+                if n > max_sizes.get(name, n):
+                    continue
+                results.append(dict(engine=name, distribution=dist, n=n, **measure(engine, cards)))
+    return results
+
+
+def write_results(results, path):
+    with open(path, 'w', newline='') as f:
+        if path.endswith('.csv'):
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+        else:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    benchmark_results = run_benchmarks()
+    print('{:<10} {:<14} {:>7} {:>10} {:>10} {:>9} {:>10}'.format(
+        'engine', 'distribution', 'n', 'checks', 'moves', 'seconds', 'peak'))
+    row = '{engine:<10} {distribution:<14} {n:>7} {checks:>10} {moves:>10} {seconds:>9.4f} {peak_bytes:>10}'
+    for result in benchmark_results:
+        print(row.format(**result))
+    if len(sys.argv) > 1:
+        write_results(benchmark_results, sys.argv[1])
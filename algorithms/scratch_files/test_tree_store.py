@@ -0,0 +1,56 @@
+import os
+import random
+import tempfile
+import unittest
+
+from tree2 import KaryTree
+from tree_store import MappedTree, dump, header
+
+
+class MappedTreeTests(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.tree')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def round_trip(self, tree):
+        dump(tree, self.path)
+        with MappedTree(self.path) as mapped:
+            return [mapped.key(a) for a in mapped.preorder()]
+
+    def test_header_keeps_arrays_aligned(self):
+        self.assertEqual(header.size, 16)
+
+    def test_root_not_node_zero(self):
+        tree = KaryTree.from_parents([1, -1, 1, 0])
+        self.assertEqual(self.round_trip(tree), [str(tree.keys[a]) for a in tree.preorder()])
+
+    def test_random_forests(self):
+        rng = random.Random(0)
+        for n in (1, 2, 50, 500):
+            parents = [-1] + [rng.randrange(a) for a in range(1, n)]
+            parents[rng.randrange(n)] = -1
+            # shuffle the node numbering so roots and parents can come anywhere
+            order = list(range(n))
+            rng.shuffle(order)
+            position = {a: b for b, a in enumerate(order)}
+            shuffled = [-1 if parents[a] == -1 else position[parents[a]] for a in order]
+            tree = KaryTree.from_parents(shuffled, keys=['k{}'.format(a) for a in order])
+            self.assertEqual(self.round_trip(tree), [tree.keys[a] for a in tree.preorder()])
+
+    def test_rejects_empty_short_and_truncated_files(self):
+        dump(KaryTree.from_parents([-1, 0, 0, 1]), self.path)
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        for broken in (b'', data[:10], data[:-1], b'XXXX' + data[4:]):
+            with open(self.path, 'wb') as f:
+                f.write(broken)
+            with self.assertRaises(ValueError):
+                MappedTree(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
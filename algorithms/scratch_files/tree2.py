@@ -1,3 +1,7 @@
+import random
+import time
+from array import array
+
 
 class TreeThree:
     def __init__(self, obj, left=None, middle=None, right=None):
@@ -15,17 +19,6 @@ class TreeThree:
             setattr(self, position + '_child', new_node)
 
 
-bt = TreeThree('a')
-bt.insert('left', 'b')
-bt.insert('middle', 'c')
-bt.insert('right', 'c')
-bt.insert('left', 'l')
-bt.insert('middle', 'm')
-bt.insert('right', 'n')
-bt.insert('left', 'p')
-
-
-
 def inorder(tree):
     if tree is not None:
         print(tree.key)
@@ -43,8 +36,138 @@ def preorder(tree):
         inorder(tree.right_child)
 
 
+class KaryTree:
+    """ tree with any number of children per node, stored in flat parallel arrays rather than a TreeThree object per
+    node. Node i has key keys[i], and its children are first_child[i] then each next_sibling along, -1 meaning none.
+    Nodes without a parent are roots, linked together as siblings of the first root """
+    def __init__(self):
+        self.keys = []
+        self.parent = array('l')
+        self.first_child = array('l')
+        self.last_child = array('l')
+        self.next_sibling = array('l')
+        self.root = -1
+        self.last_root = -1
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key, parent=-1):
+        """ appends a node as the last child of parent, or as a root, and returns its index """
+        node = len(self.keys)
+        self.keys.append(key)
+        self.parent.append(parent)
+        self.first_child.append(-1)
+        self.last_child.append(-1)
+        self.next_sibling.append(-1)
+        self.link(node, parent)
+        return node
+
+    def link(self, node, parent):
+        if parent == -1:
+            previous, self.last_root = self.last_root, node
+            if previous == -1:
+                self.root = node
+        else:
+            previous, self.last_child[parent] = self.last_child[parent], node
+            if previous == -1:
+                self.first_child[parent] = node
+        if previous != -1:
+            self.next_sibling[previous] = node
+
+    @classmethod
+    def from_parents(cls, parents, keys=None):
+        """ builds the tree in bulk from parents[i], the index of node i's parent or -1, keys defaulting to the node
+        indexes. Children keep the order of their indexes """
+        tree = cls()
+        n = len(parents)
+        tree.keys = list(range(n)) if keys is None else list(keys)
+        tree.parent = array('l', parents)
+        tree.first_child = array('l', [-1]) * n
+        tree.last_child = array('l', [-1]) * n
+        tree.next_sibling = array('l', [-1]) * n
+        for node, parent in enumerate(tree.parent):
+            tree.link(node, parent)
+        return tree
+
+    def children(self, node):
+        child = self.first_child[node]
+        while child != -1:
+            yield child
+            child = self.next_sibling[child]
+
+    def preorder(self):
+        """ node indexes, each before its children, walking the links so no stack is needed """
+        first_child, next_sibling, parent = self.first_child, self.next_sibling, self.parent
+        node = self.root
+        while node != -1:
+            yield node
+            if first_child[node] != -1:
+                node = first_child[node]
+                continue
+            while node != -1 and next_sibling[node] == -1:
+                node = parent[node]
+            if node != -1:
+                node = next_sibling[node]
+
+    def postorder(self):
+        """ node indexes, each after its children """
+        first_child, next_sibling, parent = self.first_child, self.next_sibling, self.parent
+        node = self.root
+        while node != -1:
+            while first_child[node] != -1:
+                node = first_child[node]
+            yield node
+            while next_sibling[node] == -1:
+                node = parent[node]
+                if node == -1:
+                    return
+                yield node
+            node = next_sibling[node]
+
+    def level_order(self):
+        """ node indexes a level at a time """
+        first_child, next_sibling = self.first_child, self.next_sibling
+        level = []
+        node = self.root
+        while node != -1:
+            level.append(node)
+            node = next_sibling[node]
+        while level:
+            next_level = []
+            for node in level:
+                yield node
+                child = first_child[node]
+                while child != -1:
+                    next_level.append(child)
+                    child = next_sibling[child]
+            level = next_level
+
+
+def benchmark(n=10 ** 6, seed=0):
+    """ times building a random tree of n nodes from a parent list and each traversal of it """
+    rng = random.Random(seed)
+    parents = [-1] + [rng.randrange(a) for a in range(1, n)]
+    start = time.perf_counter()
+    tree = KaryTree.from_parents(parents)
+    print('from_parents {:.3f}s'.format(time.perf_counter() - start))
+    for order in (tree.preorder, tree.postorder, tree.level_order):
+        start = time.perf_counter()
+        count = sum(1 for _ in order())
+        print('{:<12} {:.3f}s for {} nodes'.format(order.__name__, time.perf_counter() - start, count))
+
 
+if __name__ == '__main__':
+    bt = TreeThree('a')
+    bt.insert('left', 'b')
+    bt.insert('middle', 'c')
+    bt.insert('right', 'c')
+    bt.insert('left', 'l')
+    bt.insert('middle', 'm')
+    bt.insert('right', 'n')
+    bt.insert('left', 'p')
 
-print(inorder(bt))
-print('\n')
-print(preorder(bt))
+    print(inorder(bt))
+    print('\n')
+    print(preorder(bt))
+    benchmark()
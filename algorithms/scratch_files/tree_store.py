@@ -0,0 +1,158 @@
+""" Compact binary files for BinaryTree, TreeThree and KaryTree, opened through a memory map so a large tree is ready
+at once and traversed straight from the file instead of rebuilding a Python object per node.
+
+Layout, in the machine's native byte order: a 16 byte header of magic b'TREE', version, kind, slots, a pad byte, the
+node count n and the key table size; then n * slots int32 child indexes, -1 for none; then n + 1 uint32 offsets into
+the key table, which holds each node's key as UTF-8 text, so keys come back as strings whatever their type. Nodes are
+numbered in preorder, making node 0 the root. kind is POSITIONAL when the slots are named children (left, right or
+left, middle, right), or SIBLINGS for a KaryTree's first child and next sibling links """
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+
+from scratch3 import BinaryTree
+from tree2 import KaryTree, TreeThree
+
+header = struct.Struct('=4sBBBxII')
+magic = b'TREE'
+version = 1
+POSITIONAL, SIBLINGS = 0, 1
+positions = {BinaryTree: ('left', 'right'), TreeThree: ('left', 'middle', 'right')}
+
+
+def flatten(tree):
+    """ returns (kind, slots, child index array, keys) with nodes numbered in preorder from the root """
+    if isinstance(tree, KaryTree):
+        # the tree's own indexes needn't put the root first, so renumber; the root chain keeps node 0 first
+        order = list(tree.preorder())
+        index = {a: b for b, a in enumerate(order)}
+        index[-1] = -1
+        children = array('i')
+        for node in order:
+            children.append(index[tree.first_child[node]])
+            children.append(index[tree.next_sibling[node]])
+        return SIBLINGS, 2, children, [tree.keys[a] for a in order]
+    names = positions[type(tree)]
+    nodes, index = [], {}
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        index[id(node)] = len(nodes)
+        nodes.append(node)
+        stack.extend(a for a in [getattr(node, b + '_child') for b in reversed(names)] if a is not None)
+    children = array('i', [-1]) * (len(nodes) * len(names))
+    for i, node in enumerate(nodes):
+        for j, name in enumerate(names):
+            child = getattr(node, name + '_child')
+            if child is not None:
+                children[i * len(names) + j] = index[id(child)]
+    return POSITIONAL, len(names), children, [a.key for a in nodes]
+
+
+def dump(tree, path):
+    kind, slots, children, keys = flatten(tree)
+    encoded = [str(a).encode('utf-8') for a in keys]
+    offsets = array('I', [0])
+    for key in encoded:
+        offsets.append(offsets[-1] + len(key))
+    with open(path, 'wb') as f:
+        f.write(header.pack(magic, version, kind, slots, len(encoded), offsets[-1]))
+        f.write(children.tobytes())
+        f.write(offsets.tobytes())
+        f.write(b''.join(encoded))
+
+
+class MappedTree:
+    """ read only view of a dumped tree. Nodes are indexes, keys are decoded only when asked for, and the traversals
+    use an explicit stack """
+    def __init__(self, path):
+        not_tree = ValueError('{} is not a version {} tree file'.format(path, version))
+        with open(path, 'rb') as f:
+            # mmap refuses an empty file
+            if not os.fstat(f.fileno()).st_size:
+                raise not_tree
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < header.size:
+            self.map.close()
+            raise not_tree
+        tag, file_version, self.kind, self.slots, self.n, key_size = header.unpack_from(self.map)
+        if (tag != magic or file_version != version or
+                len(self.map) != header.size + 4 * self.n * self.slots + 4 * (self.n + 1) + key_size):
+            self.map.close()
+            raise not_tree
+        view = memoryview(self.map)
+        start = header.size
+        end = start + 4 * self.n * self.slots
+        self.children = view[start:end].cast('i')
+        self.offsets = view[end:end + 4 * (self.n + 1)].cast('I')
+        self.key_table = view[end + 4 * (self.n + 1):]
+
+    def __len__(self):
+        return self.n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for view in (self.children, self.offsets, self.key_table):
+            view.release()
+        self.map.close()
+
+    def key(self, node):
+        return str(self.key_table[self.offsets[node]:self.offsets[node + 1]], 'utf-8')
+
+    def child_nodes(self, node):
+        """ the node's children in order """
+        if self.kind == SIBLINGS:
+            child = self.children[2 * node]
+            while child != -1:
+                yield child
+                child = self.children[2 * child + 1]
+        else:
+            for child in self.children[node * self.slots:(node + 1) * self.slots]:
+                if child != -1:
+                    yield child
+
+    def roots(self):
+        if not self.n:
+            return []
+        if self.kind == POSITIONAL:
+            return [0]
+        # a KaryTree forest keeps its other roots as siblings of the first
+        roots, node = [], 0
+        while node != -1:
+            roots.append(node)
+            node = self.children[2 * node + 1]
+        return roots
+
+    def preorder(self):
+        stack = self.roots()[::-1]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(list(self.child_nodes(node))[::-1])
+
+
+def benchmark(path, n=10 ** 6, seed=0):
+    rng = random.Random(seed)
+    tree = KaryTree.from_parents([-1] + [rng.randrange(a) for a in range(1, n)])
+    start = time.perf_counter()
+    dump(tree, path)
+    print('dump     {:.3f}s'.format(time.perf_counter() - start))
+    start = time.perf_counter()
+    with MappedTree(path) as mapped:
+        print('open     {:.6f}s'.format(time.perf_counter() - start))
+        start = time.perf_counter()
+        count = sum(1 for _ in mapped.preorder())
+        print('preorder {:.3f}s for {} nodes'.format(time.perf_counter() - start, count))
+
+
+if __name__ == '__main__':
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else 'tree.bin')
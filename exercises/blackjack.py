@@ -2,24 +2,72 @@ import random
 
 card_labels = ['Ace'] + [str(i) for i in range(2, 11)] + ['Jack', 'Queen', 'King']
 suits = ['Hearts', 'Diamonds', 'Spades', 'Clubs']
-cards = [[a, b] for a in card_labels for b in suits]
+# a card is the int rank * 4 + suit, where rank and suit are indexes into card_labels and suits
+cards = list(range(len(card_labels) * len(suits)))
+rank_values = [11] + list(range(2, 11)) + [10] * 3
+card_values = [rank_values[a // len(suits)] for a in cards]
+label_values = dict(zip(card_labels, rank_values))
+
+
+def card_name(card):
+    return '{} of {}'.format(card_labels[card // len(suits)], suits[card % len(suits)])
 
 
 def get_card_value(hand_values):
-    card_values = ['11'] + [str(i) for i in range(2, 11)] + ['10'] * 3
-    return [int(card_values[card_labels.index(a)]) for a in hand_values]
+    return [label_values[a] for a in hand_values]
+
+
+class Hand:
+    """ running score of a hand, updated in O(1) per card. hard counts every ace as 1 and one ace is counted as 11
+    instead whenever that doesn't take the hand over 21 """
+    __slots__ = ('hard', 'aces')
+
+    def __init__(self, values=()):
+        self.hard = 0
+        self.aces = 0
+        for value in values:
+            self.add(value)
+
+    def add(self, value):
+        """ value as given by card_values, i.e. 11 for an ace """
+        if value == 11:
+            self.aces += 1
+            self.hard += 1
+        else:
+            self.hard += value
+
+    @property
+    def soft(self):
+        return self.aces > 0 and self.hard <= 11
+
+    @property
+    def total(self):
+        return self.hard + 10 if self.soft else self.hard
+
+    @property
+    def bust(self):
+        return self.hard > 21
 
 
 class Player:
     def __init__(self, role):
         self.role = role
-        self.hand = [random.choice(cards)] + [random.choice(cards)]
-        self.card_values = get_card_value([a[0] for a in self.hand])
-        self.score = sum(self.card_values)
+        self.hand = []
+        self.scorer = Hand()
         self.bust = False
+        for _ in range(2):
+            self.receive(random.choice(cards))
+
+    @property
+    def score(self):
+        return self.scorer.total
+
+    def receive(self, card):
+        self.hand.append(card)
+        self.scorer.add(card_values[card])
 
     def __str__(self):
-        return str(['{} of {}'.format(a[0], a[1]) for a in self.hand])
+        return str([card_name(a) for a in self.hand])
 
 
 def take_or_stick(player):
@@ -34,8 +82,7 @@ def take_or_stick(player):
 
 
 def receive_card(player):
-    player.hand += [random.choice(cards)]
-    player.score = sum(get_card_value([a[0] for a in player.hand]))
+    player.receive(random.choice(cards))
     if player is gambler:
         print('Your cards: {}'.format(player))
     if bust(player):
@@ -45,9 +92,7 @@ def receive_card(player):
 
 
 def bust(player):
-    if player.score <= 21:
-        return False
-    if 'Ace' in [a[0] for a in player.hand] and player.score - 10 <= 21:
+    if not player.scorer.bust:
         return False
     if player.role == 'dealer':
         print("Dealer's hand: {}".format(dealer))
@@ -60,40 +105,43 @@ def bust(player):
         return True
 
 
-print('Lets play Blackjack!')
-
-while True:
-    gambler = Player(role='player')
-    dealer = Player(role='dealer')
-    print("Hit enter to get your cards or enter 'quit' to exit")
-    choice = input("> ")
-    if choice.upper() == 'QUIT':
-        break
-    print('Your cards: {}'.format(gambler))
-    print("Dealer's hand: {}".format(dealer.hand[0]))
-    while take_or_stick(gambler) != 'S':
-        if receive_card(gambler):
-            gambler.bust = True
+def play():
+    global gambler, dealer
+    print('Lets play Blackjack!')
+
+    while True:
+        gambler = Player(role='player')
+        dealer = Player(role='dealer')
+        print("Hit enter to get your cards or enter 'quit' to exit")
+        choice = input("> ")
+        if choice.upper() == 'QUIT':
             break
-        else:
-            continue
-    if gambler.bust is False:
-        while dealer.bust is False:
-            if dealer.score >= 16 and dealer.score >= gambler.score or gambler.bust:
-                if not gambler.bust:
-                    print("Dealer's hand: {}".format(dealer))
-                print('Dealer wins')
-                print('\n' * 2)
+        print('Your cards: {}'.format(gambler))
+        print("Dealer's hand: {}".format(card_name(dealer.hand[0])))
+        while take_or_stick(gambler) != 'S':
+            if receive_card(gambler):
+                gambler.bust = True
                 break
             else:
-                print("Hit enter")
-                input('> ')
-                if receive_card(dealer) is True:
+                continue
+        if gambler.bust is False:
+            while dealer.bust is False:
+                if dealer.score >= 16 and dealer.score >= gambler.score or gambler.bust:
+                    if not gambler.bust:
+                        print("Dealer's hand: {}".format(dealer))
+                    print('Dealer wins')
+                    print('\n' * 2)
                     break
                 else:
-                    print("Dealer's hand: {}".format(dealer))
-                    continue
-print('Thanks for playing')
+                    print("Hit enter")
+                    input('> ')
+                    if receive_card(dealer) is True:
+                        break
+                    else:
+                        print("Dealer's hand: {}".format(dealer))
+                        continue
+    print('Thanks for playing')
+
 
 """
 Suggested improvements:
@@ -117,4 +165,8 @@ Suggested improvements:
    new reader. Use docstrings for class/method/function definitions so that calling help() on it will
    return the docstring explaining any details. Refactoring should also be considered with regards to making the code
    easier to test, to make it more 'DRY', and make it more robust in relation to unexpected actions or conditions.
-"""
\ No newline at end of file
+"""
+
+
+if __name__ == '__main__':
+    play()
@@ -0,0 +1,122 @@
+""" Expected values for blackjack.py's rules, computed by memoised recursion over the composition of the shoe
+rather than by sampling. As in the main loop the dealer draws until on at least 16 and at least the player's total,
+and wins ties. A composition is a tuple of the counts of each card value 2-11 left in the shoe, 11 being an ace.
+
+The strategy table built from these values is saved as JSON, so a game or simulation can load it at startup instead of
+recomputing it. """
+import json
+import os
+from functools import lru_cache
+
+values = list(range(2, 12))
+cache_size = 1 << 20
+strategy_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'blackjack_strategy.json')
+# dealer_outcomes() gives the probabilities of the dealer finishing on 16, 17, ..., 21 and, last, of going bust
+bust_index = 6
+
+
+def shoe_composition(decks=6):
+    return tuple(4 * decks * (4 if a == 10 else 1) for a in values)
+
+
+def remove(comp, value):
+    i = value - 2
+    return comp[:i] + (comp[i] - 1,) + comp[i + 1:]
+
+
+def add_card(hard, aces, value):
+    return (hard + 1, aces + 1) if value == 11 else (hard + value, aces)
+
+
+@lru_cache(maxsize=cache_size)
+def dealer_outcomes(hard, aces, target, comp):
+    """ distribution of the dealer's final total, starting from the hard total and ace count of the dealer's hand """
+    if hard > 21:
+        return (0.0,) * bust_index + (1.0,)
+    total = hard + 10 if aces and hard <= 11 else hard
+    if total >= target:
+        return tuple(float(a == total - 16) for a in range(bust_index + 1))
+    n = sum(comp)
+    outcomes = [0.0] * (bust_index + 1)
+    for value, count in zip(values, comp):
+        if count:
+            p = count / n
+            sub = dealer_outcomes(*add_card(hard, aces, value), target, remove(comp, value))
+            for i in range(bust_index + 1):
+                outcomes[i] += p * sub[i]
+    return tuple(outcomes)
+
+
+def stand_ev(total, upcard, comp, dealer_wins_ties=True):
+    """ expected value of standing on total, 1 being a win and -1 a loss """
+    dealer = dealer_outcomes(*add_card(0, 0, upcard), max(16, total), comp)
+    bust = dealer[bust_index]
+    pushes = 0.0 if dealer_wins_ties or total < 16 else dealer[total - 16]
+    # the dealer only stands on at least the player's total, so never finishes below it
+    return bust - (1.0 - bust - pushes)
+
+
+@lru_cache(maxsize=cache_size)
+def player_ev(hard, aces, upcard, comp, dealer_comp=None, dealer_wins_ties=True):
+    """ returns (stand, hit) expected values for the player's hand against the dealer's upcard, playing the best
+    decision on every later card. The player's cards are drawn from comp exactly, while the dealer's draws come from
+    dealer_comp, by default comp as it is at this decision, which keeps the dealer recursion to one run per target
+    total instead of one for every card the player might go on to draw """
+    dealer_comp = dealer_comp or comp
+    total = hard + 10 if aces and hard <= 11 else hard
+    stand = stand_ev(total, upcard, dealer_comp, dealer_wins_ties)
+    n = sum(comp)
+    hit = 0.0
+    for value, count in zip(values, comp):
+        if count:
+            new_hard, new_aces = add_card(hard, aces, value)
+            if new_hard > 21:
+                hit -= count / n
+            else:
+                hit += count / n * max(
+                    player_ev(new_hard, new_aces, upcard, remove(comp, value), dealer_comp, dealer_wins_ties))
+    return stand, hit
+
+
+def build_strategy_table(decks=6, dealer_wins_ties=True):
+    """ returns {'total,soft,upcard': [stand ev, hit ev]} for hard totals 4-21 and soft totals 12-21, the shoe being
+    full apart from the upcard """
+    table = {}
+    for upcard in values:
+        comp = remove(shoe_composition(decks), upcard)
+        for soft in (False, True):
+            for total in range(12 if soft else 4, 22):
+                state = (total - 10, 1) if soft else (total, 0)
+                table['{},{:d},{}'.format(total, soft, upcard)] = list(
+                    player_ev(*state, upcard, comp, dealer_wins_ties=dealer_wins_ties))
+    return table
+
+
+def load_strategy_table(path=strategy_path, decks=6):
+    """ loads the table saved at path, building and saving it first if there isn't one """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        table = build_strategy_table(decks)
+        with open(path, 'w') as f:
+            json.dump(table, f, indent=0, sort_keys=True)
+        return table
+
+
+class TableStrategy:
+    """ blackjack_sim strategy hitting whenever the table's hit ev beats its stand ev """
+    def __init__(self, table=None):
+        table = table or load_strategy_table()
+        self.hits = {k for k, (stand, hit) in table.items() if hit > stand}
+
+    def __call__(self, total, soft, dealer_upcard):
+        return '{},{:d},{}'.format(total, soft, dealer_upcard) in self.hits
+
+
+if __name__ == '__main__':
+    strategy = TableStrategy()
+    for soft in (False, True):
+        print('{} totals, dealer upcard 2-11 across'.format('Soft' if soft else 'Hard'))
+        for total in range(12 if soft else 4, 22):
+            print('{:>3} {}'.format(total, ' '.join('H' if strategy(total, soft, a) else 'S' for a in values)))
@@ -0,0 +1,109 @@
+""" Monte Carlo simulation of blackjack.py's rules with a pluggable player strategy. Cards are dealt from a shuffled
+multi-deck shoe held as an int8 NumPy array, and batches of hands are played across a process pool, each batch with
+its own seeded generator so results don't depend on the number of workers. Usage is
+
+    python blackjack_sim.py [number of hands] [stick at total, or 'table' for blackjack_ev's strategy table] """
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from blackjack import Hand, card_labels, rank_values, suits
+
+# value of each rank code, rank codes being the indexes of card_labels
+shoe_values = np.array(rank_values, dtype=np.int8)
+
+
+class HitBelow:
+    """ player strategy taking a card while the total is below stick_at, like the prompts of take_or_stick. A strategy
+    is any picklable callable of (total, soft, dealer_upcard) returning True to take a card """
+    def __init__(self, stick_at=16):
+        self.stick_at = stick_at
+
+    def __call__(self, total, soft, dealer_upcard):
+        return total < self.stick_at
+
+
+class Shoe:
+    """ decks of cards shuffled together, reshuffled once fewer than cut cards are left """
+    def __init__(self, rng, decks=6, cut=52):
+        self.rng = rng
+        self.ranks = np.repeat(np.arange(len(card_labels), dtype=np.int8), len(suits) * decks)
+        self.cut = cut
+        self.shuffle()
+
+    def shuffle(self):
+        # a Python list of values makes dealing one card at a time much cheaper than indexing the array
+        self.values = shoe_values[self.rng.permutation(self.ranks)].tolist()
+        self.pos = 0
+
+    def deal(self):
+        if self.pos == len(self.values) - self.cut:
+            self.shuffle()
+        self.pos += 1
+        return self.values[self.pos - 1]
+
+
+def play_hand(shoe, strategy, dealer_wins_ties=True):
+    """ returns 1 for a player win, -1 for a loss and 0 for a push """
+    player = Hand((shoe.deal(), shoe.deal()))
+    upcard = shoe.deal()
+    dealer = Hand((upcard, shoe.deal()))
+    while not player.bust and strategy(player.total, player.soft, upcard):
+        player.add(shoe.deal())
+    if player.bust:
+        return -1
+    total = player.total
+    # as in the main loop, the dealer draws until on at least 16 and at least the player's total
+    while dealer.total < 16 or dealer.total < total:
+        dealer.add(shoe.deal())
+    if dealer.bust or dealer.total < total:
+        return 1
+    if dealer.total == total and not dealer_wins_ties:
+        return 0
+    return -1
+
+
+def play_batch(args):
+    n_hands, strategy, seed, decks, dealer_wins_ties = args
+    shoe = Shoe(np.random.default_rng(seed), decks)
+    outcomes = [0, 0, 0]
+    for _ in range(n_hands):
+        outcomes[play_hand(shoe, strategy, dealer_wins_ties) + 1] += 1
+    return outcomes
+
+
+def simulate(n_hands, strategy=None, decks=6, processes=None, batch_size=100000, seed=0, dealer_wins_ties=True):
+    """ plays n_hands and returns a dict of win/loss/push rates and hands/sec. As in the interactive game the dealer
+    wins ties unless dealer_wins_ties is False """
+    strategy = strategy or HitBelow()
+    sizes = [min(batch_size, n_hands - a) for a in range(0, n_hands, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    start = time.perf_counter()
+    losses, pushes, wins = 0, 0, 0
+    tasks = [(n, strategy, s, decks, dealer_wins_ties) for n, s in zip(sizes, seeds)]
+    with Pool(processes) as pool:
+        for l, p, w in pool.imap_unordered(play_batch, tasks):
+            losses, pushes, wins = losses + l, pushes + p, wins + w
+    seconds = time.perf_counter() - start
+    return {
+        'hands': n_hands,
+        'win': wins / n_hands,
+        'loss': losses / n_hands,
+        'push': pushes / n_hands,
+        'seconds': seconds,
+        'hands_per_sec': n_hands / seconds,
+    }
+
+
+if __name__ == '__main__':
+    hands = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    if len(sys.argv) > 2 and sys.argv[2] == 'table':
+        from blackjack_ev import TableStrategy
+        player_strategy = TableStrategy()
+    else:
+        player_strategy = HitBelow(int(sys.argv[2]) if len(sys.argv) > 2 else 16)
+    result = simulate(hands, player_strategy)
+    print('{hands} hands in {seconds:.1f}s ({hands_per_sec:.0f} hands/sec)'.format(**result))
+    print('win {win:.4f}, loss {loss:.4f}, push {push:.4f}'.format(**result))
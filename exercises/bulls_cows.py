@@ -88,23 +88,38 @@ class BullTracker():
             if self.counts[-1][0] - self.counts[-2][0] == 2 and len(new) == 2:
                 self.bulls.update(new)
 
+    def eval_single_change(self, entry):
+        change = self.single_change
+        if entry[0] < self.counts[-2][0]:  # if bulls -1
+            self.bulls[change[0]] = change[1]
+        elif entry[0] > self.counts[-2][0]:  # if bulls +1
+            self.bulls[change[0]] = change[2]
+            if entry[1] > self.counts[-2][1]:  # if cows -1
+                self.exclude(change[1])
+        else:  # if bulls no change
+            if entry[1] < self.counts[-2][1]:  # if cows -1
+                self.exclude(change[2])
+            elif entry[1] > self.counts[-2][1]:  # if cows +1
+                self.exclude(change[1])
+
+    def update(self, entry):
+        """ entry is the (bulls, cows) score for the current guess """
+        self.counts.append((entry[0], entry[1]))
+        self.mem.append(self.current[:])
+        if self.check_entry(entry):
+            return
+        if self.single_change:
+            self.eval_single_change(entry)
+        for k, v in self.bulls.items():
+            self.current[k] = v
+        if entry == (2, 2) and len(self.bulls) >= 2:
+            self.shuffle()
+            return
+        self.pick_new()
+
 tracker = BullTracker()
 
 
-def eval_single_change(entry):
-    change = tracker.single_change
-    if entry[0] < tracker.counts[-2][0]:  # if bulls -1
-        tracker.bulls[change[0]] = change[1]
-    elif entry[0] > tracker.counts[-2][0]:  # if bulls +1
-        tracker.bulls[change[0]] = change[2]
-        if entry[1] > tracker.counts[-2][1]:  # if cows -1
-            tracker.exclude(change[1])
-    else:  # if bulls no change
-        if entry[1] < tracker.counts[-2][1]:  # if cows -1
-            tracker.exclude(change[2])
-        elif entry[1] > tracker.counts[-2][1]:  # if cows +1
-            tracker.exclude(change[1])
-            
 def run():
     n = 0
     while True:
@@ -118,17 +133,8 @@ def run():
         except ValueError:
             # flask flash with error?
             continue
-        tracker.counts.append((entry[0], entry[1]))
-        tracker.mem.append(tracker.current[:])
-        if tracker.check_entry(entry):
-            continue
-        if tracker.single_change:
-            eval_single_change(entry)
-        for k, v in tracker.bulls.items():
-            tracker.current[k] = v
-        if entry == (2, 2) and len(tracker.bulls) >= 2:
-            tracker.shuffle()
-            continue
-        tracker.pick_new()
+        tracker.update(entry)
+
 
-run()
\ No newline at end of file
+if __name__ == '__main__':
+    run()
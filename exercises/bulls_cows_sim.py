@@ -0,0 +1,86 @@
+""" Headless simulation of bulls and cows strategies. A strategy is any object whose str() is its current four digit
+guess and whose update((bulls, cows)) method takes the score for that guess, e.g. BullTracker or MinimaxSolver.
+Games are shared out across a process pool, and usage is
+
+    python bulls_cows_sim.py [tracker|minimax|expected] [number of random games, or 'all' for every secret] """
+import random
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from bulls_cows import BullTracker, bc_count, make_list
+from bulls_cows_solver import MinimaxSolver, candidates
+
+strategies = {
+    'tracker': BullTracker,
+    'minimax': MinimaxSolver,
+    'expected': lambda: MinimaxSolver(rule='expected'),
+}
+
+
+def play(strategy, secret, max_turns=20):
+    """ returns the number of guesses the strategy took to find secret, or None if it failed """
+    for n in range(1, max_turns + 1):
+        entry = bc_count(secret, str(strategy))
+        if entry == (4, 0):
+            return n
+        try:
+            strategy.update(entry)
+        except (ValueError, IndexError, KeyError):
+            return None
+
+
+def play_chunk(args):
+    """ plays one game per secret, or count games against random secrets when secrets is None """
+    name, secrets, count, seed, max_turns = args
+    random.seed(seed)
+    if secrets is None:
+        secrets = (make_list() for _ in range(count))
+    new_strategy = strategies[name]
+    turns = Counter()
+    for secret in secrets:
+        turns[play(new_strategy(), secret, max_turns)] += 1
+    return turns
+
+
+def simulate(name, n_games=None, processes=None, chunk_size=1000, seed=0, max_turns=20):
+    """ plays the named strategy against every possible secret, or against n_games random secrets, and returns a
+    dict with the distribution of guess counts, the number of failures and games/sec """
+    if n_games is None:
+        secrets = candidates.tolist()
+        tasks = [(name, secrets[a:a + chunk_size], None, seed + a, max_turns)
+                 for a in range(0, len(secrets), chunk_size)]
+    else:
+        tasks = [(name, None, min(chunk_size, n_games - a), seed + a, max_turns)
+                 for a in range(0, n_games, chunk_size)]
+    start = time.perf_counter()
+    turns = Counter()
+    with Pool(processes) as pool:
+        for result in pool.imap_unordered(play_chunk, tasks):
+            turns.update(result)
+    seconds = time.perf_counter() - start
+    failures = turns.pop(None, 0)
+    games = sum(turns.values()) + failures
+    return {
+        'strategy': name,
+        'games': games,
+        'guesses': dict(sorted(turns.items())),
+        'mean': sum(k * v for k, v in turns.items()) / max(games - failures, 1),
+        'failures': failures,
+        'seconds': seconds,
+        'games_per_sec': games / seconds,
+    }
+
+
+def report(result):
+    print('{strategy}: {games} games in {seconds:.1f}s ({games_per_sec:.0f} games/sec)'.format(**result))
+    print('mean guesses {mean:.3f}, failures {failures}'.format(**result))
+    for k, v in result['guesses'].items():
+        print('{:>3} guesses: {:>8} {}'.format(k, v, '#' * round(60 * v / result['games'])))
+
+
+if __name__ == '__main__':
+    strategy = sys.argv[1] if len(sys.argv) > 1 else 'tracker'
+    games = sys.argv[2] if len(sys.argv) > 2 else 'all'
+    report(simulate(strategy, None if games == 'all' else int(games)))
@@ -0,0 +1,133 @@
+""" Bulls and cows solver which picks every guess from a precomputed guess x secret score table, rather than the
+random pick_new/shuffle heuristics of BullTracker """
+from functools import lru_cache
+from itertools import permutations
+
+import numpy as np
+
+# all 3024 possible secrets, i.e. four distinct digits 1-9, one row per secret
+candidates = np.array(list(permutations(range(1, 10), 4)), dtype=np.uint8)
+# a (bulls, cows) score is stored as the single code bulls * 5 + cows, so fits in a uint8 and 0 <= code < 25
+n_codes = 25
+popcount = np.array([bin(a).count('1') for a in range(1 << 10)], dtype=np.uint8)
+
+
+def score_code(bulls, cows):
+    return bulls * 5 + cows
+
+
+def digit_masks(digits):
+    """ bitmask per secret with bit d set for each of its digits d """
+    return np.bitwise_or.reduce(np.left_shift(1, digits.astype(np.uint16)), axis=-1)
+
+
+def encode(secrets):
+    """ returns (digits, masks) for secrets given as four digit strings or sequences of ints, digits being an (n, 4)
+    uint8 array """
+    if isinstance(secrets, np.ndarray):
+        digits = secrets.astype(np.uint8, copy=False)
+    else:
+        digits = np.array([[int(a) for a in s] for s in secrets], dtype=np.uint8)
+    return digits, digit_masks(digits)
+
+
+def score_batch(guess, secrets):
+    """ vectorized bc_count, scoring a guess against every secret in one call and returning (bulls, cows) arrays.
+    secrets may be passed already encoded, and guess may be an (n, 1, 4) array to score n guesses at once.
+    Digits must be distinct within a guess and within a secret, as they are under the game's rules """
+    g_digits = np.asarray([int(a) for a in guess] if isinstance(guess, str) else guess, dtype=np.uint8)
+    s_digits, s_masks = secrets if isinstance(secrets, tuple) else encode(secrets)
+    bulls = (g_digits == s_digits).sum(axis=-1, dtype=np.uint8)
+    cows = popcount[digit_masks(g_digits) & s_masks] - bulls
+    return bulls, cows
+
+
+@lru_cache(maxsize=1)
+def score_table():
+    """ returns the 3024 x 3024 uint8 table of score codes, row for the guess and column for the secret """
+    bulls, cows = score_batch(candidates[:, None, :], encode(candidates))
+    return score_code(bulls, cows)
+
+
+class InconsistentScore(ValueError):
+    """ a score which together with the earlier ones fits no secret """
+
+
+class MinimaxSolver:
+    """ keeps the indexes of the secrets still consistent with every score received and picks the guess which splits
+    them into the smallest partitions, by worst case ('minimax') or by expected size ('expected').
+    The guesses only depend on the scores received so far, so they are memoised in book and shared between games """
+    book = {}
+
+    def __init__(self, rule='minimax', table=None):
+        self.table = score_table() if table is None else table
+        self.book = MinimaxSolver.book if table is None else {}
+        self.rule = rule
+        self.remaining = np.arange(len(candidates))
+        self.codes = (rule,)
+        # by symmetry every first guess is as good as any other
+        self.current = 0
+
+    def __str__(self):
+        return ''.join(str(a) for a in candidates[self.current])
+
+    def partition_sizes(self):
+        """ returns a (guesses, n_codes) array counting the remaining secrets which would give each score """
+        sub = self.table[:, self.remaining].astype(np.intp)
+        sub += np.arange(len(sub))[:, None] * n_codes
+        return np.bincount(sub.ravel(), minlength=len(sub) * n_codes).reshape(len(sub), n_codes)
+
+    def pick_new(self):
+        if len(self.remaining) <= 2:
+            self.current = int(self.remaining[0])
+            return
+        if self.codes in self.book:
+            self.current = self.book[self.codes]
+            return
+        sizes = self.partition_sizes()
+        if self.rule == 'expected':
+            # sum of squared partition sizes is the expected remaining count times len(self.remaining)
+            cost = (sizes * sizes).sum(axis=1)
+        else:
+            cost = sizes.max(axis=1)
+        # on a tie, prefer a guess which could itself be the secret
+        cost = cost * 2
+        cost[self.remaining] -= 1
+        self.current = self.book[self.codes] = int(cost.argmin())
+
+    def update(self, entry):
+        """ entry is the (bulls, cows) score for the current guess. A score no remaining secret gives is rejected,
+        leaving the solver as it was """
+        code = score_code(*entry)
+        remaining = self.remaining[self.table[self.current, self.remaining] == code]
+        if not len(remaining):
+            raise InconsistentScore('No secret is consistent with the scores given')
+        self.codes += (code,)
+        self.remaining = remaining
+        self.pick_new()
+
+
+def run(solver=None):
+    solver = solver or MinimaxSolver()
+    n = 0
+    while True:
+        n += 1
+        print('Attempt #{}. My guess: {}'.format(n, solver))
+        user_input = input('Bulls and cows: ')
+        if user_input == '' or user_input == '40':
+            break
+        try:
+            entry = int(user_input[0]), int(user_input[1])
+        except (ValueError, IndexError):
+            print('Enter bulls and cows as two digits, e.g. 13')
+            n -= 1
+            continue
+        try:
+            solver.update(entry)
+        except InconsistentScore:
+            print('No secret gives that score together with the earlier ones, check it and enter it again')
+            n -= 1
+
+
+if __name__ == '__main__':
+    run()
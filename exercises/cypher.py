@@ -1,4 +1,10 @@
+import os
+import string
+import sys
+import time
 import unittest
+from functools import lru_cache, partial
+from tempfile import TemporaryDirectory
 
 
 class Solution:
@@ -19,11 +25,80 @@ class Solution:
         return ''.join(letters)
 
 
+def shifted_alphabets(key):
+    key %= 26
+    lower, upper = string.ascii_lowercase, string.ascii_uppercase
+    return lower + upper, lower[key:] + lower[:key] + upper[key:] + upper[:key]
+
+
+@lru_cache(maxsize=64)
+def caesar_table(key):
+    """ str.translate table shifting ascii letters forward by key, built once per key """
+    return str.maketrans(*shifted_alphabets(key))
+
+
+@lru_cache(maxsize=64)
+def caesar_bytes_table(key):
+    return bytes.maketrans(*(a.encode('ascii') for a in shifted_alphabets(key)))
+
+
+def encrypt(text, key):
+    """ Caesar shift of str or bytes text by key, where CeasarCypher builds the result a character at a time """
+    return text.translate(caesar_bytes_table(key) if isinstance(text, (bytes, bytearray)) else caesar_table(key))
+
+
+def decrypt(text, key):
+    return encrypt(text, -key)
+
+
+def encrypt_file(src, dst, key, chunk_size=1 << 20):
+    """ streams src to dst in chunk_size pieces, so files of any size are shifted in constant memory """
+    table = caesar_bytes_table(key)
+    with open(src, 'rb') as f_in, open(dst, 'wb') as f_out:
+        for chunk in iter(partial(f_in.read, chunk_size), b''):
+            f_out.write(chunk.translate(table))
+
+
+def benchmark(size_mb=4, key=8):
+    """ prints MB/s for CeasarCypher against the translate table versions """
+    text = ('Zwddg ogjdv! ' * (size_mb * (1 << 20) // 13 + 1))[:size_mb * (1 << 20)]
+    data = text.encode('ascii')
+    runs = [
+        ('CeasarCypher', lambda: Solution().CeasarCypher(text, key)),
+        ('encrypt str', lambda: encrypt(text, key)),
+        ('encrypt bytes', lambda: encrypt(data, key)),
+    ]
+    for name, run in runs:
+        start = time.perf_counter()
+        run()
+        print('{:<14} {:>10.1f} MB/s'.format(name, size_mb / (time.perf_counter() - start)))
+
+
 class SolutionTests(unittest.TestCase):
     def test1(self):
         solution = Solution()
         self.assertEqual(solution.CeasarCypher("Zwddg ogjdv!", 8), "Hello world!")
 
+    def test_translate_matches(self):
+        text = string.ascii_letters + string.digits + ' .,!?'
+        for key in range(1, 26):
+            self.assertEqual(encrypt(text, key), Solution().CeasarCypher(text, key))
+            self.assertEqual(encrypt(text.encode('ascii'), key), Solution().CeasarCypher(text, key).encode('ascii'))
+            self.assertEqual(decrypt(encrypt(text, key), key), text)
+
+    def test_encrypt_file(self):
+        data = b'Zwddg ogjdv!\n' * 1000
+        with TemporaryDirectory() as tmp:
+            src, dst = os.path.join(tmp, 'plain.txt'), os.path.join(tmp, 'cypher.txt')
+            with open(src, 'wb') as f:
+                f.write(data)
+            encrypt_file(src, dst, 8, chunk_size=100)
+            with open(dst, 'rb') as f:
+                self.assertEqual(f.read(), b'Hello world!\n' * 1000)
+
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    if sys.argv[1:] == ['bench']:
+        benchmark()
+    else:
+        unittest.main()
@@ -0,0 +1,77 @@
+""" Recovers the key of Caesar shifted text by frequency analysis. Each message's letter histogram is counted once, and
+all 26 candidate shifts are scored against English letter frequencies in one chi-squared computation over a 26 x 26
+matrix of rolled histograms, instead of decrypting the text 26 times """
+import unittest
+from multiprocessing import Pool
+
+import numpy as np
+
+from cypher import decrypt, encrypt
+
+# relative frequencies of a-z in English text
+english_freq = np.array([
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074]) / 100
+# rolled[s, j] is the ciphertext letter which decrypts to letter j when the key is s
+rolled = (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26
+# byte -> letter index 0-25, with 26 for anything that isn't an ascii letter
+letter_index = np.full(256, 26, dtype=np.intp)
+letter_index[np.frombuffer(b'abcdefghijklmnopqrstuvwxyz', np.uint8)] = np.arange(26)
+letter_index[np.frombuffer(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', np.uint8)] = np.arange(26)
+
+
+def histograms(messages):
+    """ (n, 26) letter counts for n messages, from a single bincount over all of them """
+    data = [m.encode('ascii', 'ignore') if isinstance(m, str) else m for m in messages]
+    codes = letter_index[np.frombuffer(b''.join(data), np.uint8)]
+    codes += np.repeat(np.arange(len(data)) * 27, [len(a) for a in data])
+    return np.bincount(codes, minlength=len(data) * 27).reshape(len(data), 27)[:, :26]
+
+
+def chi_squared(hists):
+    """ (n, 26) chi-squared distance from English of each message decrypted with each key """
+    counts = hists[:, rolled]
+    expected = hists.sum(axis=1)[:, None, None] * english_freq
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.nan_to_num(((counts - expected) ** 2 / expected).sum(axis=2))
+
+
+def find_keys(messages):
+    return chi_squared(histograms(messages)).argmin(axis=1)
+
+
+def crack_many(messages, processes=None, chunk_size=10000):
+    """ returns the most likely key for each message, sharing chunks of messages out across a process pool when
+    processes is more than 1 """
+    messages = list(messages)
+    if not processes or processes == 1 or len(messages) <= chunk_size:
+        return find_keys(messages)
+    chunks = [messages[a:a + chunk_size] for a in range(0, len(messages), chunk_size)]
+    with Pool(processes) as pool:
+        return np.concatenate(pool.map(find_keys, chunks))
+
+
+def crack(message):
+    """ returns (key, plain text) """
+    key = int(find_keys([message])[0])
+    return key, decrypt(message, key)
+
+
+class CrackTests(unittest.TestCase):
+    text = 'The quick brown fox jumps over the lazy dog while the farmer sleeps in the afternoon sun'
+
+    def test_crack(self):
+        for key in range(26):
+            self.assertEqual(crack(encrypt(self.text, key)), (key, self.text))
+
+    def test_crack_many(self):
+        keys = [a % 26 for a in range(300)]
+        messages = [encrypt(self.text, a) for a in keys]
+        self.assertEqual(crack_many(messages, processes=2, chunk_size=100).tolist(), keys)
+
+    def test_no_letters(self):
+        self.assertEqual(find_keys(['', '1234!']).tolist(), [0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
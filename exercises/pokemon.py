@@ -10,23 +10,57 @@ names = 'audino bagon baltoy banette bidoof braviary bronzor carracosta charmele
         'treecko tyrogue vigoroth vulpix wailord wartortle whismur wingull yamask'.split(' ')
 
 
-def string_chain(pokemons):
+class FirstLetterIndex:
+    """ Buckets of name indexes keyed by first letter, built once and shared by the chain algorithms.
+    Sets of used names are kept as int bitsets, bit i standing for pokemons[i] """
+    def __init__(self, pokemons):
+        self.names = list(pokemons)
+        self.buckets = {}
+        for i, name in enumerate(self.names):
+            self.buckets.setdefault(name[0], []).append(i)
+        # successors[i] is the bucket of names that may follow names[i], so each lookup is O(1)
+        self.successors = [self.buckets.get(name[-1], []) for name in self.names]
+
+    def candidates(self, index, used=0):
+        """ indexes of the names that can follow names[index] and are not set in the used bitset """
+        return [a for a in self.successors[index] if not used >> a & 1]
+
+
+def string_chain(pokemons, index=None):
+    """ greedy chain from each starting name, taking the first unused successor at every step """
+    index = index or FirstLetterIndex(pokemons)
     container = []
-    n = 0
-    for x in pokemons:
-        pok = [pokemons[n]]
-        for i in pokemons:
-            if i[0] == pok[0][-1]:
-                pok.append(i)
-            break
-        for a in pokemons:
-            if a[0] == pok[-1][-1]:
-                pok.append(a)
-        n += 1
+    for n in range(len(index.names)):
+        pok, used = [n], 1 << n
+        nxt = index.candidates(n, used)
+        while nxt:
+            pok.append(nxt[0])
+            used |= 1 << nxt[0]
+            nxt = index.candidates(nxt[0], used)
         container.append(pok)
-    for a in container:
-        if len(a) == max([len(a) for a in container]):
-            return a
+    return [index.names[a] for a in max(container, key=len)]
+
+
+def longest_chain(pokemons, index=None):
+    """ exhaustive depth-first search for the/a longest chain, using an explicit stack of (path, used, candidates) """
+    index = index or FirstLetterIndex(pokemons)
+    best = []
+    for n in range(len(index.names)):
+        stack = [([n], 1 << n, iter(index.successors[n]))]
+        while stack:
+            path, used, nxt = stack[-1]
+            for a in nxt:
+                if not used >> a & 1:
+                    stack.append((path + [a], used | 1 << a, iter(index.successors[a])))
+                    break
+            else:
+                if len(path) > len(best):
+                    best = path
+                stack.pop()
+    return [index.names[a] for a in best]
 
 
-print(string_chain(names))
+if __name__ == '__main__':
+    name_index = FirstLetterIndex(names)
+    print(string_chain(names, name_index))
+    print(longest_chain(names, name_index))
@@ -0,0 +1,58 @@
+import random
+import unittest
+
+import numpy as np
+
+from bulls_cows import bc_count
+from bulls_cows_solver import (InconsistentScore, MinimaxSolver, candidates, encode, score_batch, score_code,
+                               score_table)
+
+
+class ScoreBatchTests(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.secrets = [random.sample(range(1, 10), 4) for _ in range(500)]
+
+    def test_matches_bc_count(self):
+        for guess in ['1234', '9876', '5139', '2468']:
+            bulls, cows = score_batch(guess, self.secrets)
+            expected = [bc_count(secret, guess) for secret in self.secrets]
+            self.assertEqual(list(zip(bulls.tolist(), cows.tolist())), expected)
+
+    def test_encoded_secrets(self):
+        encoded = encode(self.secrets)
+        for a, b in zip(score_batch([7, 1, 3, 2], encoded), score_batch('7132', self.secrets)):
+            np.testing.assert_array_equal(a, b)
+
+    def test_score_table(self):
+        table = score_table()
+        self.assertEqual(table.shape, (3024, 3024))
+        self.assertEqual(table.dtype, np.uint8)
+        for g, s in zip(random.sample(range(3024), 200), random.sample(range(3024), 200)):
+            guess = ''.join(str(a) for a in candidates[g])
+            self.assertEqual(table[g, s], score_code(*bc_count(candidates[s].tolist(), guess)))
+        self.assertTrue((table.diagonal() == score_code(4, 0)).all())
+
+
+
+class MinimaxSolverTests(unittest.TestCase):
+
+    def test_inconsistent_score_leaves_solver_unchanged(self):
+        solver = MinimaxSolver()
+        solver.update((2, 2))
+        remaining, codes, current = solver.remaining.copy(), solver.codes, solver.current
+        scores = [(a, b) for a in range(5) for b in range(5 - a)]
+        given = set(solver.table[current, remaining].tolist())
+        impossible = next(a for a in scores if score_code(*a) not in given)
+        with self.assertRaises(InconsistentScore):
+            solver.update(impossible)
+        np.testing.assert_array_equal(solver.remaining, remaining)
+        self.assertEqual((solver.codes, solver.current), (codes, current))
+        possible = next(a for a in scores if score_code(*a) in given)
+        solver.update(possible)
+        self.assertTrue(len(solver.remaining))
+
+
+if __name__ == '__main__':
+    unittest.main()
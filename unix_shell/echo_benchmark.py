@@ -0,0 +1,65 @@
+""" Echo throughput and latency for socket_server_2.py as its number of pre-forked workers grows. For each worker count
+a server is started, client processes each hold a connection sending message_size byte messages and waiting for every
+echo, and the totals are printed:
+
+    python echo_benchmark.py [max workers] [client processes] [seconds] [message size] """
+import socket
+import sys
+import time
+from multiprocessing import Pool, Process
+
+from socket_server_2 import HOST, PORT, echo_worker
+
+
+def run_client(args):
+    """ returns (round trips, sorted latencies in seconds) for one connection """
+    port, seconds, message_size = args
+    message = b'x' * message_size
+    reply = bytearray(message_size)
+    latencies = []
+    with socket.create_connection((HOST, port)) as sock:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        view = memoryview(reply)
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            start = time.perf_counter()
+            sock.sendall(message)
+            received = 0
+            while received < message_size:
+                n = sock.recv_into(view[received:])
+                if not n:
+                    raise ConnectionError('server closed the connection')
+                received += n
+            latencies.append(time.perf_counter() - start)
+    return len(latencies), sorted(latencies)
+
+
+def bench(n_workers, clients=8, seconds=3.0, message_size=1024, port=PORT):
+    workers = [Process(target=echo_worker, args=(HOST, port), daemon=True) for _ in range(n_workers)]
+    for worker in workers:
+        worker.start()
+    time.sleep(0.5)
+    try:
+        with Pool(clients) as pool:
+            results = pool.map(run_client, [(port, seconds, message_size)] * clients)
+    finally:
+        for worker in workers:
+            worker.terminate()
+            worker.join()
+    trips = sum(a for a, _ in results)
+    latencies = sorted(b for _, a in results for b in a)
+    p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+    megabytes = trips * message_size / seconds / 2 ** 20
+    print(f'{n_workers:>3} workers: {trips / seconds:>9.0f} echoes/sec, {megabytes:>7.1f} MB/s, '
+          f'latency p50 {p50 * 1e6:.0f}us p99 {p99 * 1e6:.0f}us')
+
+
+if __name__ == '__main__':
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    n_clients = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 3.0
+    size = int(sys.argv[4]) if len(sys.argv) > 4 else 1024
+    n = 1
+    while n <= max_workers:
+        bench(n, n_clients, duration, size)
+        n *= 2
@@ -1,24 +1,188 @@
+import math
+import os
 import socket
+import sys
+import threading
 import time
 
-sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-
-local_hostname = socket.gethostname()
-local_fqdn = socket.getfqdn()
-ip_address = socket.gethostbyname(local_hostname)
-server_address = (ip_address, 23456)
-sock.connect(server_address)  
-print(f'connecting to {local_hostname} ({local_fqdn}) with {ip_address}')
-
-# define example data to be sent to the server
-temperature_data = ["15", "22", "21", "26", "25", "19"]  
-for entry in temperature_data:  
-    print(f'data: {entry}')
-    new_data = str(f"temp: {entry}\n").encode("utf-8")
-    sock.sendall(new_data)
-    time.sleep(2)
-    data = sock.recv(1024)
-    print(f'Server message: {data}')
-    time.sleep(1)
-sock.close()
+from socket_pool import resolve, set_keepalive
+from temp_protocol import ACK, HELLO, ack_struct, pack_frame, record_re
 
+# the most buffers one sendmsg() call takes
+iov_max = os.sysconf('SC_IOV_MAX')
+
+
+def connect(host=None, port=23456):
+    # the server runs on this machine unless told otherwise; the lookup is cached by socket_pool.resolve
+    host = host or socket.gethostname()
+    server_address = resolve(host, port)
+    sock = socket.create_connection(server_address)
+    set_keepalive(sock)
+    print(f'connecting to {host} with {server_address[0]}')
+    return sock
+
+
+def send_readings(sock):
+    # define example data to be sent to the server
+    temperature_data = ["15", "22", "21", "26", "25", "19"]
+    for entry in temperature_data:
+        print(f'data: {entry}')
+        new_data = str(f"temp: {entry}\n").encode("utf-8")
+        sock.sendall(new_data)
+        time.sleep(2)
+        data = sock.recv(1024)
+        print(f'Server message: {data}')
+        time.sleep(1)
+
+
+def recv_exactly(sock, n):
+    data = bytearray()
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError('server closed the connection')
+        data += chunk
+    return bytes(data)
+
+
+def negotiate(sock, timeout=1.0):
+    """ asks for binary frames, returning whether the server agreed. A server that only knows text ignores HELLO, as
+    it holds no reading, so no reply within timeout means carrying on as text """
+    sock.sendall(HELLO)
+    sock.settimeout(timeout)
+    try:
+        return recv_exactly(sock, len(HELLO)) == HELLO
+    except socket.timeout:
+        return False
+    finally:
+        sock.settimeout(None)
+
+
+def percentile(ordered, p):
+    return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)] if ordered else 0.0
+
+
+def replay(sock, readings, batch=500, window=64, use_sendmsg=False, binary=False, timeout=30.0):
+    """ sends readings as fast as the server keeps up: batch records go in each send, while a thread counts the
+    server's acknowledgements, timing each batch from its send to its last acknowledgement. At most window batches are
+    unacknowledged at a time, and waiting over timeout seconds on the socket is an error. With binary, each batch is
+    one frame of (sensor id, timestamp, temperature) records, should the server agree to it. Returns records/sec and
+    latency percentiles in ms """
+    binary = binary and negotiate(sock)
+    if binary:
+        now = time.time()
+        records = [(a % 16, now, float(b)) for a, b in enumerate(readings)]
+        batches = [[pack_frame(records[a:a + batch])] for a in range(0, len(records), batch)]
+    else:
+        records = [f'temp: {a}\n'.encode('utf-8') for a in readings]
+        # the server only acknowledges records it can parse, so anything else would leave acks missing
+        for record in records:
+            if not record_re.fullmatch(record, endpos=len(record) - 1):
+                raise ValueError(f'the server cannot parse the reading in {record!r}')
+        batches = [records[a:a + batch] for a in range(0, len(records), batch)]
+    sock.settimeout(timeout)
+    in_flight = threading.Semaphore(window)
+    sent_at = []
+    latencies = []
+    errors = []
+
+    def read_acks():
+        try:
+            count_acks()
+        except Exception as e:
+            # hand the error to the sending loop, which may be waiting for a free window slot
+            errors.append(e)
+            in_flight.release()
+
+    def count_acks():
+        acked, acked_bytes, done = 0, 0, 0
+        buffer = bytearray(1 << 16)
+        counts = bytearray()
+        while done < len(batches):
+            try:
+                received = sock.recv_into(buffer)
+            except socket.timeout:
+                raise TimeoutError(f'no acknowledgement in {timeout}s, {acked} of {len(records)} records acknowledged')
+            if not received:
+                raise ConnectionError('server closed the connection')
+            if binary:
+                # binary acks are record counts, which may arrive split
+                counts += buffer[:received]
+                whole = len(counts) - len(counts) % ack_struct.size
+                acked += sum(a for a, in ack_struct.iter_unpack(counts[:whole]))
+                del counts[:whole]
+            else:
+                # text acks are a fixed size, so the byte count says how many records have been acknowledged
+                acked_bytes += received
+                acked = acked_bytes // len(ACK)
+            while done < len(batches) and acked >= min((done + 1) * batch, len(records)):
+                latencies.append(time.perf_counter() - sent_at[done])
+                done += 1
+                in_flight.release()
+
+    # a daemon, so an error sending can't leave the process waiting on acks that will never come
+    reader = threading.Thread(target=read_acks, daemon=True)
+    start = time.perf_counter()
+    reader.start()
+    for chunk in batches:
+        in_flight.acquire()
+        if errors:
+            raise errors[0]
+        sent_at.append(time.perf_counter())
+        if use_sendmsg:
+            # scatter/gather: the kernel copies straight from each record's buffer, with no joined copy first
+            for a in range(0, len(chunk), iov_max):
+                part = chunk[a:a + iov_max]
+                sent = sock.sendmsg(part)
+                if sent < sum(map(len, part)):
+                    sock.sendall(b''.join(part)[sent:])
+        else:
+            sock.sendall(b''.join(chunk))
+    reader.join()
+    sock.settimeout(None)
+    if errors:
+        raise errors[0]
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'protocol': 'binary' if binary else 'text',
+        'records': len(records),
+        'records_per_sec': len(records) / seconds,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def load_readings(source):
+    """ one reading per line of the file source, or source synthetic readings if it's a number. A line which isn't a
+    finite number is rejected, naming it """
+    if source.isdigit():
+        return [15 + a % 12 for a in range(int(source))]
+    readings = []
+    with open(source) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                reading = float(line)
+            except ValueError:
+                reading = None
+            if reading is None or not math.isfinite(reading):
+                raise ValueError(f'{source} line {number}: {line.strip()!r} is not a temperature reading')
+            readings.append(reading)
+    return readings
+
+
+if __name__ == '__main__':
+    sock = connect()
+    if sys.argv[1:2] == ['replay']:
+        # python socket_client.py replay [readings file or count] [batch size] [sendmsg] [binary]
+        result = replay(sock, load_readings(sys.argv[2] if len(sys.argv) > 2 else '100000'),
+                        batch=int(sys.argv[3]) if len(sys.argv) > 3 else 500, use_sendmsg='sendmsg' in sys.argv[4:],
+                        binary='binary' in sys.argv[4:])
+        print('{protocol}: {records} records, {records_per_sec:.0f} records/sec, batch latency p50 {p50_ms:.2f}ms '
+              'p95 {p95_ms:.2f}ms p99 {p99_ms:.2f}ms'.format(**result))
+    else:
+        send_readings(sock)
+    sock.close()
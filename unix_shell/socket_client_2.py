@@ -2,11 +2,13 @@
 
 import socket
 
+from socket_pool import resolve
+
 HOST = '127.0.0.1'  # The server's hostname or IP address
 PORT = 65432        # The port used by the server
 
 with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-    s.connect((HOST, PORT))
+    s.connect(resolve(HOST, PORT))
     s.sendall(b'Hello, world')
     data = s.recv(1024)
 
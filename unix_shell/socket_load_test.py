@@ -0,0 +1,46 @@
+""" Load test for socket_server_async.py: opens many client connections, holds them all open, then has every one send
+'temp: N' readings one at a time, waiting for each acknowledgement, and reports connections held and messages/sec
+
+    python socket_load_test.py [connections] [messages per connection] [port] """
+import asyncio
+import sys
+import time
+
+from socket_server_async import PORT, server_address
+from temp_protocol import ACK
+
+
+async def open_client(address, opened):
+    reader, writer = await asyncio.open_connection(*address)
+    opened.append((reader, writer))
+
+
+async def send_readings(reader, writer, messages):
+    for i in range(messages):
+        writer.write(f'temp: {15 + i % 12}\n'.encode('utf-8'))
+        await reader.readexactly(len(ACK))
+    writer.close()
+    await writer.wait_closed()
+
+
+async def load_test(address, connections=1000, messages=100, batch=500):
+    """ connections are opened batch at a time so the listen backlog isn't overrun """
+    opened = []
+    start = time.perf_counter()
+    for first in range(0, connections, batch):
+        await asyncio.gather(*(open_client(address, opened) for _ in range(first, min(first + batch, connections))))
+    connect_seconds = time.perf_counter() - start
+    print(f'{len(opened)} connections held, opened in {connect_seconds:.2f}s')
+    start = time.perf_counter()
+    await asyncio.gather(*(send_readings(reader, writer, messages) for reader, writer in opened))
+    seconds = time.perf_counter() - start
+    total = len(opened) * messages
+    print(f'{total} messages in {seconds:.2f}s, {total / seconds:.0f} messages/sec')
+    return {'connections': len(opened), 'messages': total, 'seconds': seconds, 'messages_per_sec': total / seconds}
+
+
+if __name__ == '__main__':
+    n_connections = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_messages = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    port = int(sys.argv[3]) if len(sys.argv) > 3 else PORT
+    asyncio.run(load_test(server_address(port), n_connections, n_messages))
@@ -0,0 +1,117 @@
+""" Client side connection pool for the socket servers, so many producer threads can share a few TCP connections
+instead of each paying for a hostname lookup and a connect. Idle connections are kept alive with TCP keepalive, and a
+request which fails on a dropped connection is retried once on a new one. Run it to have producer threads replay
+readings to socket_server.py / socket_server_async.py:
+
+    python socket_pool.py [threads] [batches per thread] [pool size] """
+import queue
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+from temp_protocol import ACK
+
+
+@lru_cache(maxsize=64)
+def resolve(host, port):
+    """ the address to connect to, looked up once per host and port """
+    return socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_STREAM)[0][4]
+
+
+def set_keepalive(sock, idle=60, interval=10, count=3):
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    # the finer settings are Linux names, other platforms keep their defaults
+    for option, value in (('TCP_KEEPIDLE', idle), ('TCP_KEEPINTVL', interval), ('TCP_KEEPCNT', count)):
+        if hasattr(socket, option):
+            sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+
+
+class ConnectionPool:
+    """ at most size connections to (host, port), opened on demand and reused most recently returned first """
+    def __init__(self, host, port, size=8, timeout=5.0, retries=1):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+
+    def connect(self):
+        sock = socket.create_connection(resolve(self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        set_keepalive(sock)
+        return sock
+
+    @contextmanager
+    def connection(self):
+        """ a pooled connection for the with block. It goes back to the pool afterwards, unless the block raised, when
+        it's closed as its state is unknown """
+        if not self.slots.acquire(timeout=self.timeout):
+            raise TimeoutError('no connection free in the pool')
+        try:
+            try:
+                sock = self.idle.get_nowait()
+            except queue.Empty:
+                sock = self.connect()
+            try:
+                yield sock
+            except BaseException:
+                sock.close()
+                raise
+            self.idle.put(sock)
+        finally:
+            self.slots.release()
+
+    def request(self, data, reply_size=0):
+        """ sends data and returns the next reply_size bytes received, reconnecting and resending if the connection
+        turns out to have been dropped """
+        for attempt in range(self.retries + 1):
+            try:
+                with self.connection() as sock:
+                    sock.sendall(data)
+                    reply = bytearray(reply_size)
+                    view, received = memoryview(reply), 0
+                    while received < reply_size:
+                        n = sock.recv_into(view[received:])
+                        if not n:
+                            raise ConnectionResetError('server closed the connection')
+                        received += n
+                    return bytes(reply)
+            except ConnectionError:
+                if attempt == self.retries:
+                    raise
+                # the address may have moved as well
+                resolve.cache_clear()
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def produce(pool, batches, batch=100):
+    for _ in range(batches):
+        records = b''.join(f'temp: {15 + a % 12}\n'.encode('utf-8') for a in range(batch))
+        pool.request(records, reply_size=len(ACK) * batch)
+
+
+if __name__ == '__main__':
+    n_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    n_batches = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    pool_size = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    temp_pool = ConnectionPool(socket.gethostname(), 23456, size=pool_size)
+    threads = [threading.Thread(target=produce, args=(temp_pool, n_batches)) for _ in range(n_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    temp_pool.close()
+    print(f'{n_threads} threads sent {n_threads * n_batches * 100} records over {pool_size} connections '
+          f'in {seconds:.2f}s')
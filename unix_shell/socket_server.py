@@ -1,5 +1,8 @@
 import socket
 
+from temp_protocol import LineReader, acknowledge, negotiate
+from temp_stats import TempAggregator
+
 # create TCP/IP socket
 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
@@ -11,20 +14,38 @@ print(f'starting up on {server_address} port 23456')
 sock.bind(server_address)
 # listen for incoming connections (server mode) with one connection at a time
 sock.listen(1)
+# rolling statistics per client, answered on a 'stats' or 'stats all' line
+aggregator = TempAggregator()
 
 while True:
     print('waiting for a connection')
     connection, client_address = sock.accept()
     try:
         print ('connection from', client_address)
+        # records may arrive split across reads or several to a read, so are framed on newlines
+        lines = LineReader()
+        negotiated = False
         while True:
-            data = connection.recv(64)
-            if data:
-                print(f'Data: {data}')
-                # send on the connected socket, not the listening socket
-                connection.send('Thanks client, server received'.encode('utf-8'))
+            if lines.recv_into(connection):
+                if not negotiated:
+                    # a first line of HELLO switches the connection to binary frames
+                    result = negotiate(lines)
+                    if result is None:
+                        continue
+                    (lines, hello), negotiated = result, True
+                    connection.sendall(hello)
+                count, temps, commands = lines.read_records()
+                if count:
+                    print(f'Data: {temps}')
+                    # send on the connected socket, not the listening socket, one acknowledgement per record (a count of
+                    # records for binary frames)
+                    connection.sendall(acknowledge(lines, count))
+                aggregator.record(client_address, temps)
+                for command in commands:
+                    connection.sendall(aggregator.query(client_address, command))
             else:
                 print("no more data.")
                 break
     finally:
+        aggregator.forget(client_address)
         connection.close()
\ No newline at end of file
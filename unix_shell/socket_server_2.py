@@ -1,16 +1,96 @@
+import selectors
 import socket
+import sys
+from multiprocessing import Process
 
 HOST = '127.0.0.1'  # Standard loopback interface address (localhost)
 PORT = 65432        # Port to listen on (non-privileged ports are > 1023)
 
-with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-    s.bind((HOST, PORT))
-    s.listen()
-    conn, addr = s.accept()
-    with conn:
-        print(f'Connected by {addr}')
-        while True:
-            data = conn.recv(1024)
-            if not data:
-                break
-            conn.sendall(data)
\ No newline at end of file
+
+def serve_once():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((HOST, PORT))
+        s.listen()
+        conn, addr = s.accept()
+        with conn:
+            print(f'Connected by {addr}')
+            while True:
+                data = conn.recv(1024)
+                if not data:
+                    break
+                conn.sendall(data)
+
+
+def echo_worker(host=HOST, port=PORT, buffer_size=1 << 16):
+    """ one pre-forked worker: its own listening socket on the shared port, with SO_REUSEPORT letting the kernel share
+    incoming connections out between workers, and a selectors loop echoing every client. Data is received into one
+    preallocated buffer and sent back from a view of it, so nothing is copied unless a send only partly completes """
+    sel = selectors.DefaultSelector()
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    listener.bind((host, port))
+    listener.listen(1024)
+    listener.setblocking(False)
+    sel.register(listener, selectors.EVENT_READ)
+    buffer = memoryview(bytearray(buffer_size))
+    pending = {}
+    while True:
+        for key, events in sel.select():
+            sock = key.fileobj
+            if sock is listener:
+                try:
+                    conn, addr = listener.accept()
+                except BlockingIOError:
+                    continue
+                conn.setblocking(False)
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sel.register(conn, selectors.EVENT_READ)
+                continue
+            try:
+                if events & selectors.EVENT_WRITE:
+                    data = pending.pop(sock)
+                else:
+                    try:
+                        n = sock.recv_into(buffer)
+                    except BlockingIOError:
+                        # nothing to read after all, and the buffer may still hold another client's bytes
+                        continue
+                    if not n:
+                        raise ConnectionResetError
+                    data = buffer[:n]
+                try:
+                    sent = sock.send(data)
+                except BlockingIOError:
+                    sent = 0
+            except ConnectionError:
+                pending.pop(sock, None)
+                sel.unregister(sock)
+                sock.close()
+                continue
+            if sent < len(data):
+                # the rest of this echo has to outlive the shared buffer, and no more is read until it's sent
+                pending[sock] = bytes(data[sent:])
+                sel.modify(sock, selectors.EVENT_WRITE)
+            elif key.events != selectors.EVENT_READ:
+                sel.modify(sock, selectors.EVENT_READ)
+
+
+def serve_workers(n_workers, host=HOST, port=PORT):
+    workers = [Process(target=echo_worker, args=(host, port), daemon=True) for _ in range(n_workers)]
+    for worker in workers:
+        worker.start()
+    print(f'{n_workers} workers echoing on {(host, port)}')
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+
+
+if __name__ == '__main__':
+    # python socket_server_2.py [number of pre-forked workers]
+    if len(sys.argv) > 1:
+        serve_workers(int(sys.argv[1]))
+    else:
+        serve_once()
@@ -0,0 +1,204 @@
+""" Concurrent version of socket_server.py, serving any number of clients at once on the same address and with the same
+acknowledgement for every newline framed record received, or binary frames for clients that negotiate them (see
+temp_protocol.py). Readings are kept in rolling statistics per client, which a client can fetch by sending a 'stats' or
+'stats all' line. Either asyncio streams or, with the 'selectors' argument, a
+non-blocking loop on selectors.DefaultSelector (epoll on Linux) drive the connections:
+
+    python socket_server_async.py [asyncio|selectors] [port] [workers] [queue size] [block|drop]
+
+With asyncio, readings pass from the connections to a pool of workers through a bounded queue (see Pipeline), whose
+depth and counters a 'stats pipeline' line returns. The selectors loop records readings as it reads them. """
+import asyncio
+import json
+import selectors
+import socket
+import sys
+
+from temp_protocol import LineReader, acknowledge, negotiate
+from temp_stats import TempAggregator
+
+PORT = 23456
+aggregator = TempAggregator()
+
+
+def server_address(port=PORT):
+    return socket.gethostbyname(socket.gethostname()), port
+
+
+def respond(client_address, lines):
+    """ records the complete readings in lines and returns the acknowledgements, then any replies to commands """
+    count, temps, commands = lines.read_records()
+    aggregator.record(client_address, temps)
+    return acknowledge(lines, count) + b''.join(aggregator.query(client_address, a) for a in commands)
+
+
+class Pipeline:
+    """ a bounded queue of (client address, temperatures) batches between the connections' receive loops and workers
+    recording them. When the queue is full a receive loop either waits for room, reading nothing more meanwhile so the
+    client's sends back up through TCP flow control, or with drop discards the batch and counts its readings. delay
+    is seconds of simulated processing per batch.
+
+    A client's stats queries and its disconnect go through the same queue, as (client address, command, reply
+    future) and (client address, None, None), so they see every batch the client sent before them: a worker records
+    a batch as soon as it takes it, and the queue hands items out in order """
+    def __init__(self, workers=4, size=256, drop=False, delay=0.0):
+        self.queue = asyncio.Queue(size)
+        self.drop = drop
+        self.delay = delay
+        self.tasks = [asyncio.create_task(self.work()) for _ in range(workers)]
+        self.max_depth = 0
+        self.paused = 0
+        self.dropped = 0
+        self.processed = 0
+
+    async def submit(self, client_address, temps):
+        if self.queue.full():
+            if self.drop:
+                self.dropped += len(temps)
+                return
+            self.paused += 1
+        await self.queue.put((client_address, temps, None))
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    async def close(self, client_address):
+        """ forgets a client once the batches it already queued are recorded, never dropping the request """
+        await self.queue.put((client_address, None, None))
+
+    async def work(self):
+        while True:
+            client_address, temps, reply = await self.queue.get()
+            if reply is not None:
+                reply.set_result(aggregator.query(client_address, temps))
+            elif temps is None:
+                aggregator.forget(client_address)
+            else:
+                aggregator.record(client_address, temps)
+                self.processed += len(temps)
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+            self.queue.task_done()
+
+    def summary(self):
+        return {
+            'depth': self.queue.qsize(),
+            'max_depth': self.max_depth,
+            'size': self.queue.maxsize,
+            'workers': len(self.tasks),
+            'processed': self.processed,
+            'paused': self.paused,
+            'dropped': self.dropped,
+        }
+
+    async def query(self, client_address, command):
+        """ as TempAggregator.query, answered once the client's queued batches are recorded, plus 'stats pipeline' """
+        if command == b'stats pipeline':
+            return json.dumps(self.summary()).encode('utf-8') + b'\n'
+        reply = asyncio.get_running_loop().create_future()
+        await self.queue.put((client_address, command, reply))
+        return await reply
+
+
+async def handle_client(reader, writer, pipeline):
+    client_address = writer.get_extra_info('peername')
+    print('connection from', client_address)
+    lines = LineReader()
+    negotiated = False
+    try:
+        while True:
+            data = await reader.read(1 << 14)
+            if not data:
+                break
+            lines.feed(data)
+            reply = b''
+            if not negotiated:
+                result = negotiate(lines)
+                if result is None:
+                    continue
+                (lines, reply), negotiated = result, True
+            count, temps, commands = lines.read_records()
+            if temps:
+                await pipeline.submit(client_address, temps)
+            reply += acknowledge(lines, count) + b''.join([await pipeline.query(client_address, a) for a in commands])
+            if reply:
+                writer.write(reply)
+                await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        print('closed', client_address)
+        await pipeline.close(client_address)
+        writer.close()
+
+
+async def serve_asyncio(address, workers=4, queue_size=256, drop=False, delay=0.0):
+    pipeline = Pipeline(workers, queue_size, drop, delay)
+    server = await asyncio.start_server(lambda reader, writer: handle_client(reader, writer, pipeline), *address,
+                                        backlog=4096, reuse_address=True)
+    async with server:
+        await server.serve_forever()
+
+
+class SelectorClient:
+    """ per connection state for serve_selectors: the framing buffer, whether its protocol is settled yet and any
+    acknowledgements not yet sent """
+    def __init__(self, address):
+        self.address = address
+        self.lines = LineReader()
+        self.negotiated = False
+        self.outgoing = bytearray()
+
+
+def serve_selectors(address):
+    sel = selectors.DefaultSelector()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(address)
+    sock.listen(4096)
+    sock.setblocking(False)
+    sel.register(sock, selectors.EVENT_READ)
+    while True:
+        for key, events in sel.select():
+            if key.fileobj is sock:
+                connection, client_address = sock.accept()
+                print('connection from', client_address)
+                connection.setblocking(False)
+                sel.register(connection, selectors.EVENT_READ, SelectorClient(client_address))
+                continue
+            connection, client = key.fileobj, key.data
+            try:
+                if events & selectors.EVENT_READ:
+                    if not client.lines.recv_into(connection):
+                        raise ConnectionResetError('client closed the connection')
+                    if not client.negotiated:
+                        result = negotiate(client.lines)
+                        if result is not None:
+                            (client.lines, hello), client.negotiated = result, True
+                            client.outgoing += hello
+                    if client.negotiated:
+                        client.outgoing += respond(client.address, client.lines)
+                if client.outgoing:
+                    del client.outgoing[:connection.send(client.outgoing)]
+            except BlockingIOError:
+                pass
+            except ConnectionError:
+                print('closed', client.address)
+                aggregator.forget(client.address)
+                sel.unregister(connection)
+                connection.close()
+                continue
+            # while acks are waiting on a client that isn't reading them, stop reading its records
+            wanted = selectors.EVENT_WRITE if client.outgoing else selectors.EVENT_READ
+            if key.events != wanted:
+                sel.modify(connection, wanted, client)
+
+
+if __name__ == '__main__':
+    backend = sys.argv[1] if len(sys.argv) > 1 else 'asyncio'
+    address = server_address(int(sys.argv[2]) if len(sys.argv) > 2 else PORT)
+    print(f'starting up on {address} with {backend}')
+    if backend == 'selectors':
+        serve_selectors(address)
+    else:
+        workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+        queue_size = int(sys.argv[4]) if len(sys.argv) > 4 else 256
+        asyncio.run(serve_asyncio(address, workers, queue_size, drop='drop' in sys.argv[5:]))
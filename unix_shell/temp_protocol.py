@@ -0,0 +1,164 @@
+""" Framing for the newline terminated 'temp: N' records sent by socket_client.py. Records can arrive split across, or
+several to one, recv() calls, so bytes are gathered in one reusable buffer and only complete records are parsed, a
+whole batch per regex pass over a memoryview of the buffer rather than a copy per message. Lines starting 'stats' are
+query commands rather than records.
+
+A client that opens with the HELLO line, and gets HELLO back, switches to binary frames instead: a little endian uint32
+record count and float64 base timestamp, then that many packed (uint16 sensor id, uint32 milliseconds after the base,
+float32 temperature) records of 10 bytes each. Timestamps are rounded to the millisecond, and a frame can span at most
+max_span seconds, about 49.7 days. The server acknowledges each batch of binary records with a uint32 count rather than
+an ACK apiece """
+import re
+import struct
+import sys
+import time
+
+record_re = re.compile(rb'temp: *(-?\d+(?:\.\d+)?)')
+command_re = re.compile(rb'^stats.*$', re.MULTILINE)
+ACK = 'Thanks client, server received'.encode('utf-8')
+HELLO = b'BIN1\n'
+frame_header = struct.Struct('<Id')
+record_struct = struct.Struct('<HIf')
+ack_struct = struct.Struct('<I')
+max_span = (2 ** 32 - 1) / 1000
+
+
+class LineReader:
+    """ buffer[start:end] holds bytes received but not yet parsed """
+    def __init__(self, size=1 << 16):
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.start = 0
+        self.end = 0
+
+    def make_room(self, n):
+        """ makes space for at least n more bytes, moving any partial record to the front or growing the buffer """
+        if len(self.buffer) - self.end >= n:
+            return
+        pending = self.end - self.start
+        if pending + n > len(self.buffer):
+            self.view.release()
+            self.buffer.extend(bytes(max(pending + n, len(self.buffer))))
+            self.view = memoryview(self.buffer)
+        self.buffer[:pending] = self.buffer[self.start:self.end]
+        self.start, self.end = 0, pending
+
+    def recv_into(self, sock, n=1 << 14):
+        """ receives straight into the buffer and returns the byte count, 0 meaning the connection closed """
+        self.make_room(n)
+        received = sock.recv_into(self.view[self.end:], n)
+        self.end += received
+        return received
+
+    def feed(self, data):
+        self.make_room(len(data))
+        self.buffer[self.end:self.end + len(data)] = data
+        self.end += len(data)
+
+    def read_records(self):
+        """ returns (number of complete records, their temperatures, any commands), leaving a partial record
+        buffered. Only lines holding a reading count as records, so a malformed line is never acknowledged """
+        last = self.buffer.rfind(b'\n', self.start, self.end)
+        if last == -1:
+            return 0, [], []
+        commands = []
+        with self.view[self.start:last + 1] as chunk:
+            temps = list(map(float, record_re.findall(chunk)))
+            if self.buffer.find(b'stats', self.start, last + 1) != -1:
+                commands = [a.rstrip(b'\r') for a in command_re.findall(chunk)]
+        self.start = last + 1
+        if self.start == self.end:
+            self.start = self.end = 0
+        return len(temps), temps, commands
+
+
+class FrameReader(LineReader):
+    """ the same buffering for binary frames, decoding each whole frame's records in one iter_unpack over a
+    memoryview """
+    def frames(self):
+        """ yields (base timestamp, packed records) for every complete frame, leaving a partial frame buffered """
+        while self.end - self.start >= frame_header.size:
+            n, base = frame_header.unpack_from(self.buffer, self.start)
+            body = self.start + frame_header.size
+            if self.end - body < n * record_struct.size:
+                break
+            with self.view[body:body + n * record_struct.size] as frame:
+                yield base, list(record_struct.iter_unpack(frame))
+            self.start = body + n * record_struct.size
+        if self.start == self.end:
+            self.start = self.end = 0
+
+    def read_frames(self):
+        """ returns the (sensor id, timestamp, temperature) records of every complete frame """
+        return [(a, base + b / 1000, c) for base, records in self.frames() for a, b, c in records]
+
+    def read_records(self):
+        """ as LineReader.read_records, binary clients having no commands """
+        temps = [a[2] for _, records in self.frames() for a in records]
+        return len(temps), temps, []
+
+
+def pack_frame(records):
+    """ one frame of (sensor id, timestamp, temperature) records, timed in milliseconds from the earliest. Records
+    spanning more than max_span seconds need more than one frame """
+    base = min(a[1] for a in records) if records else 0.0
+    if records and max(a[1] for a in records) - base > max_span:
+        raise ValueError(f'a frame can span at most {max_span} seconds')
+    frame = bytearray(frame_header.size + len(records) * record_struct.size)
+    frame_header.pack_into(frame, 0, len(records), base)
+    for offset, (sensor, timestamp, temp) in zip(range(frame_header.size, len(frame), record_struct.size), records):
+        record_struct.pack_into(frame, offset, sensor, round((timestamp - base) * 1000), temp)
+    return frame
+
+
+def negotiate(lines):
+    """ chooses the protocol from a new connection's first line: returns the reader to use from then on and the reply
+    owed to the client, a FrameReader holding whatever followed HELLO and HELLO itself, or lines untouched and
+    nothing. None until the first line is complete """
+    if lines.buffer.find(b'\n', lines.start, lines.end) == -1:
+        return None
+    if not lines.buffer.startswith(HELLO, lines.start):
+        return lines, b''
+    frames = FrameReader()
+    frames.feed(lines.view[lines.start + len(HELLO):lines.end])
+    return frames, HELLO
+
+
+def acknowledge(reader, count):
+    """ the acknowledgement for count records, in the reader's protocol """
+    if isinstance(reader, FrameReader):
+        return ack_struct.pack(count) if count else b''
+    return ACK * count
+
+
+def benchmark(n=10 ** 6, chunk_sizes=(64, 1 << 12, 1 << 16), frame_records=500):
+    """ bytes/record, and records/sec parsing n records which arrive in pieces of each chunk size, as from successive
+    recv() calls, for binary frames of frame_records records, and for text both as sent now, the temperature alone,
+    and carrying the same sensor id and millisecond timestamp as binary, though the server parses only the
+    temperature out of text """
+    readings = [15 + a % 12 for a in range(n)]
+    now = time.time()
+    records = [(a % 16, now + a / 100, b) for a, b in enumerate(readings)]
+    frames = [pack_frame(records[a:a + frame_records]) for a in range(0, n, frame_records)]
+    protocols = {
+        'text': (LineReader, b''.join(f'temp: {a}\n'.encode('utf-8') for a in readings)),
+        'text, same fields': (LineReader, b''.join(f'sensor: {a} time: {b:.3f} temp: {c}\n'.encode('utf-8')
+                                                   for a, b, c in records)),
+        'binary': (FrameReader, b''.join(frames)),
+    }
+    for name, (reader_type, data) in protocols.items():
+        print(f'{name}: {len(data) / n:.1f} bytes/record')
+        for chunk_size in chunk_sizes:
+            chunks = [data[a:a + chunk_size] for a in range(0, len(data), chunk_size)]
+            reader = reader_type()
+            start = time.perf_counter()
+            parsed = 0
+            for chunk in chunks:
+                reader.feed(chunk)
+                parsed += reader.read_records()[0]
+            seconds = time.perf_counter() - start
+            print(f'{chunk_size:>6} byte chunks {parsed / seconds:>12.0f} records/sec')
+
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
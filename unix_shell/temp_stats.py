@@ -0,0 +1,80 @@
+""" Rolling statistics over the most recent temperature readings of each client of the socket server """
+import json
+from bisect import bisect_left, insort
+
+# updates are O(window), so the window is capped; at the cap a reading still takes around 16us
+max_window = 100000
+
+
+class RollingStats:
+    """ the last window readings in a ring buffer, with a running sum for the mean and the same readings kept sorted,
+    which gives min, max and percentiles by index. Each reading costs O(1) for the ring and sum, but O(window) to
+    delete the reading it replaces from the sorted list and insert itself. Those are memmoves of pointers, which for
+    windows up to max_window beat O(log n) structures written in Python """
+    def __init__(self, window=1000):
+        if not 0 < window <= max_window:
+            raise ValueError('window must be from 1 to {}'.format(max_window))
+        self.window = window
+        self.ring = [0.0] * window
+        self.pos = 0
+        self.count = 0
+        self.total = 0.0
+        self.ordered = []
+
+    def add(self, value):
+        if self.count == self.window:
+            old = self.ring[self.pos]
+            self.total -= old
+            del self.ordered[bisect_left(self.ordered, old)]
+        else:
+            self.count += 1
+        self.ring[self.pos] = value
+        self.pos = (self.pos + 1) % self.window
+        self.total += value
+        insort(self.ordered, value)
+
+    def percentile(self, p):
+        """ nearest rank percentile, p from 0 to 100 """
+        return self.ordered[round(p / 100 * (self.count - 1))] if self.count else None
+
+    def summary(self):
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'min': self.ordered[0],
+            'max': self.ordered[-1],
+            'mean': self.total / self.count,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+        }
+
+
+class TempAggregator:
+    """ RollingStats per connected client, and answers to the query commands
+
+        stats      the asking client's readings
+        stats all  every connected client's, keyed by 'host:port' """
+    def __init__(self, window=1000):
+        self.window = window
+        self.clients = {}
+
+    def record(self, client, temps):
+        if client not in self.clients:
+            self.clients[client] = RollingStats(self.window)
+        add = self.clients[client].add
+        for temp in temps:
+            add(temp)
+
+    def forget(self, client):
+        self.clients.pop(client, None)
+
+    def query(self, client, command):
+        """ returns the reply to command as a line of JSON """
+        if command == b'stats all':
+            reply = {'{}:{}'.format(*a): b.summary() for a, b in self.clients.items()}
+        elif command == b'stats':
+            reply = self.clients[client].summary() if client in self.clients else {'count': 0}
+        else:
+            reply = {'error': 'unknown command {!r}'.format(command.decode('utf-8', 'replace'))}
+        return json.dumps(reply).encode('utf-8') + b'\n'
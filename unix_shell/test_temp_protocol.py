@@ -0,0 +1,137 @@
+import random
+import unittest
+
+from temp_protocol import HELLO, FrameReader, LineReader, max_span, negotiate, pack_frame
+from temp_stats import RollingStats, max_window
+
+
+def chunked(data, rng, largest=50):
+    """ data cut into pieces of random sizes, as successive recv() calls might return it """
+    start = 0
+    while start < len(data):
+        size = rng.randint(1, largest)
+        yield data[start:start + size]
+        start += size
+
+
+class LineReaderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def read_all(self, reader, data):
+        count, temps, commands = 0, [], []
+        for chunk in chunked(data, self.rng):
+            reader.feed(chunk)
+            a, b, c = reader.read_records()
+            count += a
+            temps += b
+            commands += c
+        return count, temps, commands
+
+    def test_records_split_across_reads(self):
+        readings = [round(self.rng.uniform(-30, 40), 1) for _ in range(2000)]
+        data = b''.join(f'temp: {a}\n'.encode('utf-8') for a in readings)
+        # a buffer far smaller than the data has to compact and grow as it goes
+        self.assertEqual(self.read_all(LineReader(size=8), data), (len(readings), readings, []))
+
+    def test_line_longer_than_buffer(self):
+        data = b'temp: 1\n' + b' ' * 100 + b'temp: 2\n'
+        self.assertEqual(self.read_all(LineReader(size=4), data), (2, [1.0, 2.0], []))
+
+    def test_commands_and_malformed_lines(self):
+        data = b'temp: 10\ntemp: abc\nstats\nbogus\ntemp: 20\r\nstats all\r\ntemp: 30\ntemp: 4'
+        self.assertEqual(self.read_all(LineReader(size=8), data), (3, [10.0, 20.0, 30.0], [b'stats', b'stats all']))
+
+    def test_partial_record_stays_buffered(self):
+        reader = LineReader()
+        reader.feed(b'temp: 1')
+        self.assertEqual(reader.read_records(), (0, [], []))
+        reader.feed(b'5\n')
+        self.assertEqual(reader.read_records(), (1, [15.0], []))
+
+
+class FrameReaderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(1)
+        self.records = [(self.rng.randrange(16), 1.7e9 + a * 0.25, float(self.rng.randint(-30, 40)))
+                        for a in range(1000)]
+        self.data = b''.join(pack_frame(self.records[a:a + 37]) for a in range(0, len(self.records), 37))
+
+    def assertRecordsEqual(self, records):
+        self.assertEqual(len(records), len(self.records))
+        for (a, b, c), (d, e, f) in zip(records, self.records):
+            self.assertEqual((a, c), (d, f))
+            self.assertAlmostEqual(b, e, delta=0.001)
+
+    def test_frames_split_across_feeds(self):
+        reader = FrameReader(size=8)
+        records = []
+        for chunk in chunked(self.data, self.rng, largest=200):
+            reader.feed(chunk)
+            records += reader.read_frames()
+        self.assertRecordsEqual(records)
+
+    def test_read_records(self):
+        reader = FrameReader()
+        reader.feed(self.data)
+        count, temps, commands = reader.read_records()
+        self.assertEqual((count, temps, commands), (len(self.records), [a[2] for a in self.records], []))
+
+    def test_negotiate(self):
+        lines = LineReader()
+        lines.feed(HELLO[:-1])
+        self.assertIsNone(negotiate(lines))
+        lines.feed(HELLO[-1:] + self.data[:100])
+        reader, reply = negotiate(lines)
+        self.assertIsInstance(reader, FrameReader)
+        self.assertEqual(reply, HELLO)
+        reader.feed(self.data[100:])
+        self.assertRecordsEqual(reader.read_frames())
+
+    def test_frame_span(self):
+        reader = FrameReader()
+        reader.feed(pack_frame([(1, 100.0, 20.0), (2, 100.0 + max_span, 21.0)]))
+        self.assertEqual([(a, round(b, 3), c) for a, b, c in reader.read_frames()],
+                         [(1, 100.0, 20.0), (2, round(100.0 + max_span, 3), 21.0)])
+        with self.assertRaises(ValueError):
+            pack_frame([(1, 100.0, 20.0), (2, 100.01 + max_span, 21.0)])
+
+    def test_negotiate_text(self):
+        lines = LineReader()
+        lines.feed(b'temp: 21\n')
+        self.assertEqual(negotiate(lines), (lines, b''))
+        self.assertEqual(lines.read_records(), (1, [21.0], []))
+
+
+class RollingStatsTests(unittest.TestCase):
+
+    def test_window_eviction(self):
+        rng = random.Random(2)
+        stats = RollingStats(window=50)
+        values = []
+        for _ in range(500):
+            value = rng.choice([rng.uniform(-30, 40), 20.0])
+            stats.add(value)
+            values.append(value)
+            window = sorted(values[-50:])
+            summary = stats.summary()
+            self.assertEqual(summary['count'], len(window))
+            self.assertEqual((summary['min'], summary['max']), (window[0], window[-1]))
+            self.assertAlmostEqual(summary['mean'], sum(window) / len(window))
+            self.assertEqual(summary['p50'], window[round(0.5 * (len(window) - 1))])
+            self.assertEqual(summary['p95'], window[round(0.95 * (len(window) - 1))])
+
+    def test_empty(self):
+        self.assertEqual(RollingStats().summary(), {'count': 0})
+
+    def test_window_capped(self):
+        RollingStats(max_window)
+        for window in (0, max_window + 1):
+            with self.assertRaises(ValueError):
+                RollingStats(window)
+
+
+if __name__ == '__main__':
+    unittest.main()